@@ -0,0 +1,86 @@
+# Перевірка часу імпорту аналітичних модулів lab2 через python -X importtime
+# Кожен модуль імпортується в окремому чистому процесі; перевіряється, що UI-залежності
+# (streamlit, matplotlib) і профілювальники (cProfile, pstats, tracemalloc - їх
+# instrumentation імпортує лише в режимі профілювання) не потрапляють у ядро,
+# і що час імпорту не перевищує ліміт.
+# Ненульовий код виходу означає регресію.
+#
+# Запуск з каталогу lab2: python bench_import.py --max-ms 1500
+import argparse
+import os
+import subprocess
+import sys
+
+MODULES = ['lab2an', 'parallel', 'instrumentation']
+FORBIDDEN = ['streamlit', 'matplotlib', 'cProfile', 'pstats', 'tracemalloc']
+
+
+def _env():
+    here = os.path.dirname(os.path.abspath(__file__))
+    return dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [here, os.environ.get('PYTHONPATH')])))
+
+
+def loaded_modules(module):
+    """Усі модулі (sys.modules) процесу після import module."""
+    result = subprocess.run([sys.executable, '-c', f'import sys, {module}; print(" ".join(sys.modules))'],
+                            capture_output=True, text=True, env=_env(), check=True)
+    return result.stdout.split()
+
+
+def import_times(module, repeats=3):
+    """
+    Імпортує module у новому процесі repeats разів.
+    Повертає (найменший сумарний час, мкс; {пряма залежність module: сумарний час, мкс}).
+    """
+    env = _env()
+    best = None
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                capture_output=True, text=True, env=env, check=True)
+        # рядки виводяться після завершення імпорту, тобто діти йдуть перед батьком;
+        # рівень вкладеності - відступ по два пробіли
+        total, children, pending = None, {}, {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            level = (len(name) - len(name.lstrip()) - 1) // 2
+            name = name.strip()
+            if level == 1:
+                pending[name] = int(cumulative)
+            elif level == 0:
+                if name == module:
+                    total, children = int(cumulative), pending
+                pending = {}
+        if best is None or total < best[0]:
+            best = (total, children)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Час імпорту модулів lab2 (-X importtime)")
+    parser.add_argument('--modules', nargs='+', default=MODULES)
+    parser.add_argument('--max-ms', type=float, default=None, help="ліміт сумарного часу імпорту модуля")
+    parser.add_argument('--top', type=int, default=5, help="скільки найдовших залежностей показати")
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        total, modules = import_times(module)
+        print(f"{module}: {total / 1000:.1f} мс")
+        # заборонені пакети шукаємо у повному списку модулів процесу, а не лише серед прямих залежностей
+        loaded = loaded_modules(module)
+        for name in FORBIDDEN:
+            if any(m == name or m.startswith(name + '.') for m in loaded):
+                failures.append(f"{module} імпортує {name}")
+        for name, micros in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {name:<20} {micros / 1000:8.1f} мс")
+        if args.max_ms is not None and total / 1000 > args.max_ms:
+            failures.append(f"{module}: {total / 1000:.1f} мс > {args.max_ms} мс")
+
+    if failures:
+        raise SystemExit("Регресія часу імпорту:\n" + '\n'.join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Бенчмарк запитів lab2an на синтетичних даних у пам'яті (без файлів і мережі)
+# Порівняння: лише обчислення запиту та обчислення + текстовий звіт (stdout -> devnull),
+# щоб бачити, скільки часу займає саме форматування виводу.
+# Також перевіряє, що запити на таблицях у компактній схемі (apply_schema, як compact=True)
+# дають ті самі результати, що й на таблицях без неї: допуск нульовий, бо VHI в схемі - float64
+import contextlib
+import os
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from lab2an import (apply_schema, change_province_ids, get_vhi_for_year, find_extremes, get_vhi_for_years_range,
+                    find_extreme_droughts_simple, report_vhi_for_year, report_extremes,
+                    report_vhi_for_years_range, report_extreme_droughts)
+
+years = range(1982, 2025)
+weeks = 52
+
+
+def synthetic_provinces(n_provinces=25, seed=0):
+    """Таблиці областей зі стовпцями як у read_vhi_data."""
+    rng = np.random.default_rng(seed)
+    year = np.repeat(np.array(years), weeks)
+    week = np.tile(np.arange(1, weeks + 1), len(years))
+    province_data = {}
+    for province_id in range(1, n_provinces + 1):
+        n = len(year)
+        vci = rng.uniform(0, 100, n)
+        tci = rng.uniform(0, 100, n)
+        province_data[change_province_ids(province_id)] = pd.DataFrame({
+            'Рік': year,
+            'Тиждень': week,
+            'SMN': rng.uniform(0, 0.6, n),
+            'SMT': rng.uniform(250, 310, n),
+            'VCI': vci,
+            'TCI': tci,
+            'VHI': 0.5 * vci + 0.5 * tci,
+        })
+    return province_data
+
+
+def queries(province_data, names):
+    return [
+        (get_vhi_for_year(province_data, names[0], 2020), names[0], 2020, province_data),
+        (find_extremes(province_data, names, [2018, 2019, 2020]), names, [2018, 2019, 2020], province_data),
+        (get_vhi_for_years_range(province_data, names, 2015, 2020), names, 2015, 2020, province_data),
+        (find_extreme_droughts_simple(province_data, threshold_percent=20, vhi_threshold=25),),
+    ]
+
+
+def queries_and_reports(province_data, names):
+    results = queries(province_data, names)
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        for report, args in zip([report_vhi_for_year, report_extremes,
+                                 report_vhi_for_years_range, report_extreme_droughts], results):
+            report(*args)
+    return results
+
+
+def check_compact_equivalence(province_data, names):
+    """
+    Порівнює результати всіх запитів на province_data і на тих самих таблицях у компактній схемі.
+    Значення мають збігатися точно; типи стовпців Рік/Тиждень можуть відрізнятися.
+    """
+    compact = {name: apply_schema(df) for name, df in province_data.items()}
+    # до запитів додано відсутню область, щоб порівняти й порожні результати
+    names = list(names) + ['Невідома']
+    for wide, narrow in zip(queries(province_data, names), queries(compact, names)):
+        expected, actual = wide[0], narrow[0]
+        if isinstance(expected, dict):
+            assert expected.keys() == actual.keys()
+            for name in expected:
+                pd.testing.assert_frame_equal(expected[name], actual[name], check_dtype=False, check_exact=True)
+        elif isinstance(expected, pd.DataFrame):
+            pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_exact=True)
+        else:
+            assert expected == actual, (expected, actual)
+
+
+def main():
+    province_data = synthetic_provinces()
+    names = list(province_data)[:5]
+    check_compact_equivalence(province_data, names)
+    print("Компактна схема: результати всіх запитів збігаються з повною точністю")
+    repeats = 20
+    query_ms = timeit.timeit(lambda: queries(province_data, names), number=repeats) / repeats * 1000
+    report_ms = timeit.timeit(lambda: queries_and_reports(province_data, names), number=repeats) / repeats * 1000
+    print(f"Областей: {len(province_data)}, рядків в області: {len(years) * weeks}")
+    print(f"Лише запити:      {query_ms:8.2f} мс")
+    print(f"Запити + звіти:   {report_ms:8.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# Інструментування конвеєра VHI: час етапів, байти/рядки, лічильники по областях,
+# помилки та необов'язкове профілювання (cProfile / tracemalloc).
+# Записи зберігаються у пам'яті та вивантажуються у файл JSON lines (один запис на рядок),
+# щоб будувати графіки продуктивності конвеєра між запусками.
+#
+# Використання:
+#   metrics = PipelineMetrics(profile='cprofile')
+#   province_data = read_all_provinces('vhi_data', metrics=metrics)
+#   print(metrics.report()); metrics.dump('vhi_metrics.jsonl')
+import datetime
+import io
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+PROFILE_MODES = (None, 'cprofile', 'tracemalloc')
+
+
+class PipelineMetrics:
+    """
+    Збирач метрик одного запуску конвеєра.
+    profile: None, 'cprofile' або 'tracemalloc' - режим захоплення для блоку profiling().
+    """
+
+    def __init__(self, run_id=None, profile=None):
+        if profile not in PROFILE_MODES:
+            raise ValueError(f"Невідомий режим профілювання: {profile}. Доступні: cprofile, tracemalloc")
+        self.run_id = run_id or datetime.datetime.now().isoformat(timespec='seconds')
+        self.profile = profile
+        self.records = []
+        self.counters = defaultdict(int)
+        self.profiles = []
+
+    @contextmanager
+    def stage(self, name, province=None):
+        """
+        Вимірює час етапу. Повертає словник запису, у який можна додати
+        'bytes' та 'rows'; виняток записується як помилка етапу і передається далі.
+        """
+        record = {'stage': name, 'province': province}
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record['seconds'] = time.perf_counter() - started
+            self.records.append(record)
+
+    def count(self, name, province=None, value=1):
+        self.counters[(name, province)] += value
+
+    def error(self, stage, error, province=None):
+        """Помилка, яку конвеєр обробив сам (без винятку назовні)."""
+        self.records.append({'stage': stage, 'province': province, 'seconds': 0.0,
+                             'error': f"{type(error).__name__}: {error}"})
+        self.count('errors', province)
+
+    @contextmanager
+    def profiling(self, label):
+        """Профілює блок у режимі self.profile; без режиму нічого не робить."""
+        if self.profile is None:
+            yield
+            return
+        # профілювальники імпортуються лише тут, щоб не сповільнювати імпорт ядра lab2an
+        if self.profile == 'cprofile':
+            import cProfile
+            import pstats
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                out = io.StringIO()
+                pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(20)
+                self.profiles.append({'label': label, 'mode': 'cprofile', 'stats': out.getvalue()})
+            return
+        import tracemalloc
+
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:20]
+            if not was_tracing:
+                tracemalloc.stop()
+            self.profiles.append({'label': label, 'mode': 'tracemalloc', 'current_bytes': current,
+                                  'peak_bytes': peak, 'top': [str(stat) for stat in top]})
+
+    def summary(self):
+        """Підсумок по етапах: кількість викликів, сумарний час, байти, рядки, помилки."""
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record['stage'], {'calls': 0, 'seconds': 0.0, 'bytes': 0,
+                                                        'rows': 0, 'errors': 0})
+            total['calls'] += 1
+            total['seconds'] += record['seconds']
+            total['bytes'] += record.get('bytes', 0)
+            total['rows'] += record.get('rows', 0)
+            total['errors'] += 'error' in record
+        return totals
+
+    def report(self):
+        lines = [f"{'етап':<14} {'викликів':>8} {'час, с':>10} {'байтів':>12} {'рядків':>10} {'помилок':>8}"]
+        for name, total in self.summary().items():
+            lines.append(f"{name:<14} {total['calls']:>8} {total['seconds']:>10.4f} {total['bytes']:>12} "
+                         f"{total['rows']:>10} {total['errors']:>8}")
+        return '\n'.join(lines)
+
+    def dump(self, path):
+        """Дописує записи етапів, лічильники та профілі у файл JSON lines."""
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in self.records:
+                f.write(json.dumps({'run_id': self.run_id, 'type': 'stage', **record}, ensure_ascii=False) + '\n')
+            for (name, province), value in self.counters.items():
+                f.write(json.dumps({'run_id': self.run_id, 'type': 'counter', 'name': name,
+                                    'province': province, 'value': value}, ensure_ascii=False) + '\n')
+            for profile in self.profiles:
+                f.write(json.dumps({'run_id': self.run_id, 'type': 'profile', **profile},
+                                   ensure_ascii=False) + '\n')
+
+
+class _NullMetrics:
+    """Заглушка без накладних витрат для викликів без metrics."""
+
+    @contextmanager
+    def stage(self, name, province=None):
+        yield {}
+
+    def count(self, name, province=None, value=1):
+        pass
+
+    def error(self, stage, error, province=None):
+        pass
+
+    @contextmanager
+    def profiling(self, label):
+        yield
+
+
+NULL_METRICS = _NullMetrics()
+
+
+def load_metrics(path):
+    """Читає файл JSON lines у список словників (для графіків по запусках)."""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -4,37 +4,117 @@ import os
 import datetime
 import numpy as np
 import re
-import streamlit as st
-import matplotlib.pyplot as plt
+import sys
+
+from instrumentation import NULL_METRICS, PipelineMetrics
+
+# Ядро без UI-залежностей: streamlit і matplotlib тут не імпортуються, щоб пакетні
+# задачі та процеси пулу стартували швидко. Помилки завантажувачів передаються
+# у функцію-обробник: за замовчуванням stderr, у Streamlit - set_error_reporter(streamlit_error_reporter).
+def print_error_reporter(message):
+    print(message, file=sys.stderr)
+
+def streamlit_error_reporter(message):
+    import streamlit as st
+    st.error(message)
+
+_error_reporter = print_error_reporter
+
+def set_error_reporter(reporter=None):
+    """Встановлює обробник повідомлень про помилки (None - вивід у stderr)."""
+    global _error_reporter
+    _error_reporter = reporter or print_error_reporter
+
+def report_error(message):
+    _error_reporter(message)
+
+# Компактна схема стовпців VHI, яка застосовується під час розбору файлу:
+# роки та тижні вміщуються в int16/int8, індексам достатньо точності float32.
+# VHI лишається float64: його вибирають і агрегують запити, тож їхні результати
+# збігаються з compact=False точно (перевірка - bench_queries.py)
+VHI_SCHEMA = {
+    'Рік': 'int16',
+    'Тиждень': 'int8',
+    'SMN': 'float32',
+    'SMT': 'float32',
+    'VCI': 'float32',
+    'TCI': 'float32',
+    'VHI': 'float64',
+    'Площа_VHI_менше_15': 'float32',
+    'Площа_VHI_менше_35': 'float32',
+    'Область': 'category'
+}
+
+def apply_schema(df, schema=VHI_SCHEMA):
+    """Приводить наявні у таблиці стовпці до типів схеми."""
+    return df.astype({col: dtype for col, dtype in schema.items() if col in df.columns})
+
+def memory_report(before, after):
+    """
+    Порівнює пам'ять (байти, deep=True) двох таблиць або словників таблиць
+    з однаковими стовпцями, наприклад до і після apply_schema.
+    """
+    def usage(frames):
+        if hasattr(frames, 'columns'):
+            frames = [frames]
+        elif isinstance(frames, dict):
+            frames = frames.values()
+        total = None
+        for df in frames:
+            col_usage = df.memory_usage(index=False, deep=True)
+            total = col_usage if total is None else total + col_usage
+        return total
+
+    report = pd.DataFrame({'до, байт': usage(before), 'після, байт': usage(after)})
+    report.loc['Разом'] = report.sum()
+    report['коефіцієнт'] = report['до, байт'] / report['після, байт']
+    return report
+
+def combine_provinces(province_data, compact=True):
+    """Одна таблиця з усіх областей зі стовпцем 'Область' (категоріальним у компактній схемі)."""
+    df = pd.concat([df.assign(Область=province_name) for province_name, df in province_data.items()],
+                   ignore_index=True)
+    return apply_schema(df) if compact else df
 
 def create_directory(dir_name='vhi_data'):
     if not os.path.exists(dir_name):
         os.makedirs(dir_name)
     return dir_name
 
-def download_vhi_data(province_id, year1=1981, year2=2024, dir_name='vhi_data'):
+def download_vhi_data(province_id, year1=1981, year2=2024, dir_name='vhi_data', metrics=None):
+    metrics = metrics or NULL_METRICS
     create_directory(dir_name)
     url = f"https://www.star.nesdis.noaa.gov/smcd/emb/vci/VH/get_TS_admin.php?country=UKR&provinceID={province_id}&year1={year1}&year2={year2}&type=Mean"
     now = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     file_name = f"{dir_name}/vhi_id_{province_id}_{now}.csv"
 
     try:
-        vhi_url = urllib.request.urlopen(url)
-        out = open(file_name, 'wb')
-        out.write(vhi_url.read())
-        out.close()
+        with metrics.stage('download', province_id) as stage:
+            vhi_url = urllib.request.urlopen(url)
+            data = vhi_url.read()
+            out = open(file_name, 'wb')
+            out.write(data)
+            out.close()
+            stage['bytes'] = len(data)
+        metrics.count('downloaded', province_id)
         return file_name
     except Exception as e:
-        st.error(f"Помилка при завантаженні даних для області {province_id}: {e}")
+        metrics.count('errors', province_id)
+        report_error(f"Помилка при завантаженні даних для області {province_id}: {e}")
         return None
 
-def read_vhi_data(file_path):
+def read_vhi_data(file_path, metrics=None, province=None, compact=True):
+    metrics = metrics or NULL_METRICS
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        with metrics.stage('read_file', province) as stage:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+            stage['bytes'] = len(content)
 
-        content = re.sub(r'<[^>]+>', '', content)
-        lines = content.split('\n')
+        with metrics.stage('strip_html', province) as stage:
+            content = re.sub(r'<[^>]+>', '', content)
+            lines = content.split('\n')
+            stage['rows'] = len(lines)
         start_line = 0
         for i, line in enumerate(lines):
             if 'year' in line.lower() and 'week' in line.lower():
@@ -48,7 +128,7 @@ def read_vhi_data(file_path):
                     break
 
         temp_file = file_path + '.temp'
-        with open(temp_file, 'w', encoding='utf-8') as f:
+        with metrics.stage('write_temp', province) as stage, open(temp_file, 'w', encoding='utf-8') as f:
             if 'year' not in lines[start_line].lower() or 'week' not in lines[start_line].lower():
                 f.write("year,week,SMN,SMT,VCI,TCI,VHI,%Area_VHI_LESS_15,%Area_VHI_LESS_35\n")
 
@@ -58,32 +138,39 @@ def read_vhi_data(file_path):
                     cleaned_line = re.sub(r'^,+|,+$', '', cleaned_line)
                     cleaned_line = re.sub(r',+', ',', cleaned_line)
                     f.write(cleaned_line + '\n')
+            stage['bytes'] = f.tell()
 
         try:
-            df = pd.read_csv(temp_file, index_col=False)
+            with metrics.stage('read_csv', province) as stage:
+                try:
+                    df = pd.read_csv(temp_file, index_col=False)
+                except pd.errors.ParserError:
+                    df = pd.read_csv(temp_file, index_col=False, sep=',', header=0,
+                                     names=["year", "week", "SMN", "SMT", "VCI", "TCI", "VHI",
+                                            "%Area_VHI_LESS_15", "%Area_VHI_LESS_35"])
+                stage['rows'] = len(df)
         except pd.errors.EmptyDataError:
-            st.error(f"Файл {file_path} не містить даних після очищення.")
+            metrics.count('errors', province)
+            report_error(f"Файл {file_path} не містить даних після очищення.")
             return None
-        except pd.errors.ParserError:
-            df = pd.read_csv(temp_file, index_col=False, sep=',', header=0,
-                             names=["year", "week", "SMN", "SMT", "VCI", "TCI", "VHI",
-                                    "%Area_VHI_LESS_15", "%Area_VHI_LESS_35"])
 
         try:
             os.remove(temp_file)
         except:
             pass
 
-        df.columns = [col.strip() for col in df.columns]
-        df = df[pd.to_numeric(df['year'], errors='coerce').notna()]
-        df = df.dropna(subset=['year', 'week'])
+        with metrics.stage('coerce', province) as stage:
+            df.columns = [col.strip() for col in df.columns]
+            df = df[pd.to_numeric(df['year'], errors='coerce').notna()]
+            df = df.dropna(subset=['year', 'week'])
 
-        df['year'] = df['year'].astype(int)
-        df['week'] = df['week'].astype(int)
+            df['year'] = df['year'].astype(int)
+            df['week'] = df['week'].astype(int)
 
-        for col in ['SMN', 'SMT', 'VCI', 'TCI', 'VHI', '%Area_VHI_LESS_15', '%Area_VHI_LESS_35']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+            for col in ['SMN', 'SMT', 'VCI', 'TCI', 'VHI', '%Area_VHI_LESS_15', '%Area_VHI_LESS_35']:
+                if col in df.columns:
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
+            stage['rows'] = len(df)
 
         column_mapping = {
             'year': 'Рік',
@@ -101,10 +188,13 @@ def read_vhi_data(file_path):
             if old_name in df.columns:
                 df = df.rename(columns={old_name: new_name})
 
+        if compact:
+            df = apply_schema(df)
         return df
 
     except Exception as e:
-        st.error(f"Помилка при читанні CSV-файлу {file_path}: {e}")
+        metrics.count('errors', province)
+        report_error(f"Помилка при читанні CSV-файлу {file_path}: {e}")
         return None
 
 def change_province_ids(old_id):
@@ -119,32 +209,37 @@ def change_province_ids(old_id):
     }
     return province_map.get(old_id, f"Невідома область: {old_id}")
 
-def download_all_provinces(year1=1981, year2=2024):
+def download_all_provinces(year1=1981, year2=2024, metrics=None):
     data_dir = create_directory()
     files = {}
 
     for province_id in range(1, 26):
-        file_path = download_vhi_data(province_id, year1, year2, data_dir)
+        file_path = download_vhi_data(province_id, year1, year2, data_dir, metrics)
         if file_path:
             files[province_id] = file_path
 
     return files
 
-def read_all_provinces(data_dir='vhi_data'):
+def read_all_provinces(data_dir='vhi_data', metrics=None, compact=True):
+    metrics = metrics or NULL_METRICS
     province_data = {}
 
     try:
-        for file_name in os.listdir(data_dir):
-            if file_name.startswith('vhi_id_') and file_name.endswith('.csv'):
-                province_id = int(file_name.split('_')[2])
-                file_path = os.path.join(data_dir, file_name)
-
-                df = read_vhi_data(file_path)
-                if df is not None and 'VHI' in df.columns:
-                    province_name = change_province_ids(province_id)
-                    province_data[province_name] = df
+        with metrics.profiling('read_all_provinces'):
+            for file_name in os.listdir(data_dir):
+                if file_name.startswith('vhi_id_') and file_name.endswith('.csv'):
+                    province_id = int(file_name.split('_')[2])
+                    file_path = os.path.join(data_dir, file_name)
+
+                    df = read_vhi_data(file_path, metrics, province_id, compact)
+                    if df is not None and 'VHI' in df.columns:
+                        province_name = change_province_ids(province_id)
+                        province_data[province_name] = df
+                        metrics.count('provinces_read', province_id)
+                        metrics.count('rows', province_id, len(df))
     except Exception as e:
-        st.error(f"Помилка при зчитуванні всіх файлів: {e}")
+        metrics.error('read_all', e)
+        report_error(f"Помилка при зчитуванні всіх файлів: {e}")
 
     return province_data
 
@@ -152,113 +247,90 @@ def read_all_provinces(data_dir='vhi_data'):
 def get_vhi_for_year(province_data, province_name, year):
     """
     Повертає ряд VHI для вказаної області за вказаний рік
+    (None, якщо даних немає). Для виводу - report_vhi_for_year.
     """
-    if province_name not in province_data:
-        print(f"Дані для області '{province_name}' не знайдено.")
+    df = province_data.get(province_name)
+    if df is None:
         return None
-    
-    df = province_data[province_name]
-    result = df[df['Рік'] == year][['Тиждень', 'VHI']].copy()
-    
+
+    result = df.loc[df['Рік'].to_numpy() == year, ['Тиждень', 'VHI']]
     if result.empty:
-        print(f"Немає даних VHI для області '{province_name}' за {year} рік.")
         return None
-    
-    print(f"\nДані VHI для області {province_name} за {year} рік:")
-    print(result.to_string(index=False))
     return result
 
 def find_extremes(province_data, province_names, years):
     """
     Знаходить екстремуми (мін і макс), середнє та медіану VHI 
-    для вказаних областей і років
+    для вказаних областей і років. Області без даних пропускаються.
+    Для виводу - report_extremes.
     """
     results = []
     
     for province_name in province_names:
-        if province_name not in province_data:
-            print(f"Дані для області '{province_name}' не знайдено.")
+        df = province_data.get(province_name)
+        if df is None:
             continue
-            
-        df = province_data[province_name]
-        df_years = df[df['Рік'].isin(years)]
-        
-        if df_years.empty:
-            print(f"Немає даних для області '{province_name}' за вказані роки.")
+
+        vhi = df['VHI'].to_numpy()[df['Рік'].isin(years).to_numpy()]
+        if len(vhi) == 0:
             continue
-            
-        vhi_min = df_years['VHI'].min()
-        vhi_max = df_years['VHI'].max()
-        vhi_mean = df_years['VHI'].mean()
-        vhi_median = df_years['VHI'].median()
-        
+
+        # пропуски не враховуються, як у методах pandas
+        vhi = vhi[~np.isnan(vhi)]
+        if len(vhi) == 0:
+            vhi = np.array([np.nan])
         results.append({
             'Область': province_name,
-            'Мінімальний VHI': vhi_min,
-            'Максимальний VHI': vhi_max,
-            'Середній VHI': vhi_mean,
-            'Медіана VHI': vhi_median
+            'Мінімальний VHI': vhi.min(),
+            'Максимальний VHI': vhi.max(),
+            'Середній VHI': vhi.mean(),
+            'Медіана VHI': np.median(vhi)
         })
-        
-        print(f"\nСтатистика VHI для області {province_name} за роки {years}:")
-        print(f"Мінімальний VHI: {vhi_min:.2f}")
-        print(f"Максимальний VHI: {vhi_max:.2f}")
-        print(f"Середній VHI: {vhi_mean:.2f}")
-        print(f"Медіана VHI: {vhi_median:.2f}")
     
     return pd.DataFrame(results)
 
 def get_vhi_for_years_range(province_data, province_names, year_start, year_end):
     """
-    Повертає ряд VHI за вказаний діапазон років для вказаних областей
+    Повертає ряд VHI за вказаний діапазон років для вказаних областей.
+    Для виводу - report_vhi_for_years_range.
     """
     results = {}
     
     for province_name in province_names:
-        if province_name not in province_data:
-            print(f"Дані для області '{province_name}' не знайдено.")
-            continue
-            
-        df = province_data[province_name]
-        mask = (df['Рік'] >= year_start) & (df['Рік'] <= year_end)
-        result = df.loc[mask, ['Рік', 'Тиждень', 'VHI']].copy()
-        
-        if result.empty:
-            print(f"Немає даних VHI для області '{province_name}' за період {year_start}-{year_end}.")
+        df = province_data.get(province_name)
+        if df is None:
             continue
-            
-        results[province_name] = result
-        
-        print(f"\nДані VHI для області {province_name} за період {year_start}-{year_end}:")
-        print(result.to_string(index=False))
+
+        year = df['Рік'].to_numpy()
+        result = df.loc[(year >= year_start) & (year <= year_end), ['Рік', 'Тиждень', 'VHI']]
+        if not result.empty:
+            results[province_name] = result
     
     return results
 
 def find_extreme_droughts_simple(province_data, threshold_percent=20, vhi_threshold=15, min_weeks=3):
     """
     Спрощена версія: знаходить роки, коли більше threshold_percent% областей
-    мали екстремальні посухи, виводить лише роки та назви областей
+    мали екстремальні посухи. Повертає список {'Рік', 'Області'} або None.
+    Для виводу - report_extreme_droughts.
     """
+    # кількість тижнів посухи для кожної області та року - один прохід по кожній таблиці
+    drought_counts = {}
     all_years = set()
-    for df in province_data.values():
-        all_years.update(df['Рік'].unique())
-    all_years = sorted(all_years)
-    
+    for province_name, df in province_data.items():
+        years = df['Рік'].to_numpy()
+        all_years.update(np.unique(years).tolist())
+        drought = years[df['VHI'].to_numpy() < vhi_threshold]
+        values, counts = np.unique(drought, return_counts=True)
+        drought_counts[province_name] = dict(zip(values.tolist(), counts.tolist()))
+
+    total_provinces = len(province_data)
+    threshold_count = total_provinces * threshold_percent / 100
     drought_years = []
     
-    for year in all_years:
-        affected_provinces = []
-        
-        for province_name, df in province_data.items():
-            year_data = df[df['Рік'] == year]
-            
-            if not year_data.empty:
-                drought_weeks = year_data[year_data['VHI'] < vhi_threshold]
-                if len(drought_weeks) >= min_weeks:
-                    affected_provinces.append(province_name)
-        
-        total_provinces = len(province_data)
-        threshold_count = total_provinces * threshold_percent / 100
+    for year in sorted(all_years):
+        affected_provinces = [province_name for province_name, counts in drought_counts.items()
+                              if counts.get(year, 0) >= min_weeks]
         
         if len(affected_provinces) > threshold_count:
             drought_years.append({
@@ -266,10 +338,55 @@ def find_extreme_droughts_simple(province_data, threshold_percent=20, vhi_thresh
                 'Області': affected_provinces
             })
     
+    if not drought_years:
+        return None
+    return drought_years
+
+
+# Вивід результатів запитів (окремо від обчислень)
+# province_data - щоб відрізнити відсутню область від області без даних за період
+def report_province_not_found(province_data, province_name):
+    if province_data is not None and province_name not in province_data:
+        print(f"Дані для області '{province_name}' не знайдено.")
+        return True
+    return False
+
+def report_vhi_for_year(result, province_name, year, province_data=None):
+    if result is None:
+        if not report_province_not_found(province_data, province_name):
+            print(f"Немає даних VHI для області '{province_name}' за {year} рік.")
+        return
+    print(f"\nДані VHI для області {province_name} за {year} рік:")
+    print(result.to_string(index=False))
+
+def report_extremes(extremes, province_names, years, province_data=None):
+    found = set(extremes['Область']) if not extremes.empty else set()
+    for province_name in province_names:
+        if province_name not in found and not report_province_not_found(province_data, province_name):
+            print(f"Немає даних для області '{province_name}' за вказані роки.")
+    for row in extremes.itertuples(index=False):
+        print(f"\nСтатистика VHI для області {row[0]} за роки {years}:")
+        print(f"Мінімальний VHI: {row[1]:.2f}")
+        print(f"Максимальний VHI: {row[2]:.2f}")
+        print(f"Середній VHI: {row[3]:.2f}")
+        print(f"Медіана VHI: {row[4]:.2f}")
+
+def report_vhi_for_years_range(results, province_names, year_start, year_end, province_data=None):
+    for province_name in province_names:
+        result = results.get(province_name)
+        if result is None:
+            if report_province_not_found(province_data, province_name):
+                continue
+            print(f"Немає даних VHI для області '{province_name}' за період {year_start}-{year_end}.")
+            continue
+        print(f"\nДані VHI для області {province_name} за період {year_start}-{year_end}:")
+        print(result.to_string(index=False))
+
+def report_extreme_droughts(drought_years, threshold_percent=20):
     if not drought_years:
         print(f"\nНе знайдено років, коли більше {threshold_percent}% областей "
               f"зазнавали екстремальних посух.")
-        return None
+        return
     
     print(f"\nРоки, коли більше {threshold_percent}% областей мали екстремальні посухи:")
     print("--------------------------------------------------")
@@ -279,15 +396,16 @@ def find_extreme_droughts_simple(province_data, threshold_percent=20, vhi_thresh
         print("Уражені області:")
         for province in entry['Області']:
             print(f"- {province}")
-    
-    return drought_years
 
 # Приклад використання функцій:
 if __name__ == "__main__":
     # Завантажуємо дані (якщо ще не завантажені)
+    metrics = PipelineMetrics()
     data_dir = create_directory()
-    files = download_all_provinces(1981, 2024)
-    province_data = read_all_provinces(data_dir)
+    files = download_all_provinces(1981, 2024, metrics)
+    province_data = read_all_provinces(data_dir, metrics)
+    print(metrics.report())
+    metrics.dump('vhi_metrics.jsonl')
     
     if not province_data:
         print("Не вдалося завантажити дані. ")
@@ -295,23 +413,22 @@ if __name__ == "__main__":
         # 1. Отримати VHI для області за вказаний рік
         print("\n=== Завдання 1: Ряд VHI для області за вказаний рік ===")
         vhi_year = get_vhi_for_year(province_data, "Київська", 2020)
+        report_vhi_for_year(vhi_year, "Київська", 2020, province_data)
         
         # 2. Пошук екстремумів для вказаних областей і років
         print("\n=== Завдання 2: Пошук екстремумів для вказаних областей і років ===")
-        extremes = find_extremes(
-            province_data, 
-            ["Київська", "Львівська", "Одеська"], 
-            [2018, 2019, 2020]
-        )
+        extremes_provinces = ["Київська", "Львівська", "Одеська"]
+        extremes_years = [2018, 2019, 2020]
+        extremes = find_extremes(province_data, extremes_provinces, extremes_years)
+        report_extremes(extremes, extremes_provinces, extremes_years, province_data)
         
         # 3. Ряд VHI за вказаний діапазон років для вказаних областей
         print("\n=== Завдання 3: Ряд VHI за діапазон років для вказаних областей ===")
-        vhi_range = get_vhi_for_years_range(
-            province_data, 
-            ["Київська", "Харківська"], 
-            2015, 2020
-        )
+        range_provinces = ["Київська", "Харківська"]
+        vhi_range = get_vhi_for_years_range(province_data, range_provinces, 2015, 2020)
+        report_vhi_for_years_range(vhi_range, range_provinces, 2015, 2020, province_data)
         
         # 4. Пошук років з екстремальними посухами
         print("\n=== Завдання 4: Пошук років з екстремальними посухами ===")
-        droughts = find_extreme_droughts_simple(province_data, threshold_percent=20)
\ No newline at end of file
+        droughts = find_extreme_droughts_simple(province_data, threshold_percent=20)
+        report_extreme_droughts(droughts, threshold_percent=20)
\ No newline at end of file
@@ -0,0 +1,184 @@
+# Навантажувальний тест сервісу vhi_service.py на localhost
+# Кілька клієнтів з постійними з'єднаннями (keep-alive) надсилають суміш запитів
+# year/range/extremes/drought; вимірюються затримки (p50/p95/p99) та пропускна здатність.
+# Режими: окремі GET-запити, ті самі запити пакетами через POST /batch,
+# повторні GET з If-None-Match (відповіді 304).
+#
+# Запуск з каталогу lab2:
+#   python load_test_service.py --spawn --data-dir vhi_data --clients 16 --requests 200
+#   (--spawn запускає сервіс у дочірньому процесі; без нього - тест уже запущеного сервісу)
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+
+MODES = ['get', 'batch', 'etag']
+PROVINCES = ["Київська", "Львівська", "Одеська", "Харківська", "Полтавська", "Вінницька"]
+
+
+def make_queries(count, seed=0):
+    """Випадкова суміш запитів: (назва, параметри)."""
+    rng = np.random.default_rng(seed)
+    queries = []
+    for _ in range(count):
+        kind = rng.choice(['year', 'range', 'extremes', 'drought'], p=[0.4, 0.3, 0.2, 0.1])
+        year = int(rng.integers(1985, 2024))
+        names = ','.join(rng.choice(PROVINCES, size=int(rng.integers(1, 4)), replace=False))
+        if kind == 'year':
+            params = {'province': str(rng.choice(PROVINCES)), 'year': year}
+        elif kind == 'range':
+            params = {'provinces': names, 'start': year - 5, 'end': year}
+        elif kind == 'extremes':
+            params = {'provinces': names, 'years': f"{year - 1},{year}"}
+        else:
+            params = {'vhi_threshold': int(rng.choice([15, 25, 35]))}
+        queries.append((str(kind), params))
+    return queries
+
+
+class Connection:
+    """Мінімальний HTTP/1.1-клієнт з keep-alive."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        return self
+
+    async def request(self, method, target, body=b'', headers=None):
+        head = f"{method} {target} HTTP/1.1\r\nHost: {self.host}\r\nAccept-Encoding: gzip\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        head += f"Content-Length: {len(body)}\r\n\r\n"
+        self.writer.write(head.encode('utf-8') + body)
+        await self.writer.drain()
+
+        response = (await self.reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        status = int(response[0].split(' ')[1])
+        response_headers = {}
+        for line in response[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                response_headers[name.strip().lower()] = value.strip()
+        payload = await self.reader.readexactly(int(response_headers.get('content-length', 0)))
+        return status, response_headers, payload
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def target_for(kind, params):
+    return f"/{kind}?{urlencode(params)}"
+
+
+async def run_client(host, port, queries, mode, batch_size, latencies, counters):
+    connection = await Connection(host, port).open()
+    etags = {}
+    try:
+        if mode == 'batch':
+            for start in range(0, len(queries), batch_size):
+                chunk = [{'query': kind, 'params': params} for kind, params in queries[start:start + batch_size]]
+                started = time.perf_counter()
+                status, _, payload = await connection.request('POST', '/batch', json.dumps(chunk).encode('utf-8'),
+                                                              {'Content-Type': 'application/json'})
+                latencies.append(time.perf_counter() - started)
+                counters[status] = counters.get(status, 0) + 1
+                counters['bytes'] = counters.get('bytes', 0) + len(payload)
+            return
+        for kind, params in queries:
+            target = target_for(kind, params)
+            headers = {'If-None-Match': etags[target]} if mode == 'etag' and target in etags else None
+            started = time.perf_counter()
+            status, response_headers, payload = await connection.request('GET', target, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            counters[status] = counters.get(status, 0) + 1
+            counters['bytes'] = counters.get('bytes', 0) + len(payload)
+            if 'etag' in response_headers:
+                etags[target] = response_headers['etag']
+    finally:
+        await connection.close()
+
+
+async def run_load(host, port, clients, requests, mode, batch_size, seed):
+    latencies, counters = [], {}
+    tasks = []
+    for client in range(clients):
+        queries = make_queries(requests, seed + client)
+        if mode == 'etag':
+            # кожен запит двічі: другий раз очікується 304
+            queries = [query for query in queries for _ in range(2)]
+        tasks.append(run_client(host, port, queries, mode, batch_size, latencies, counters))
+    started = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return latencies, counters, time.perf_counter() - started
+
+
+async def wait_ready(host, port, timeout=60.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            connection = await Connection(host, port).open()
+            status, _, _ = await connection.request('GET', '/health')
+            await connection.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        if time.perf_counter() > deadline:
+            raise SystemExit(f"Сервіс {host}:{port} не відповідає")
+        await asyncio.sleep(0.2)
+
+
+def report(mode, clients, requests, batch_size, latencies, counters, elapsed):
+    latency_ms = np.array(latencies) * 1000
+    queries = clients * requests * (2 if mode == 'etag' else 1)
+    statuses = ', '.join(f"{status}: {count}" for status, count in sorted(counters.items(), key=str)
+                         if status != 'bytes')
+    unit = f"пакетів по {batch_size}" if mode == 'batch' else "запитів"
+    print(f"{mode:>6}: {queries} запитів за {elapsed:6.2f} с ({queries / elapsed:8.0f} запитів/с), "
+          f"{len(latencies)} {unit}: p50={np.percentile(latency_ms, 50):7.2f} мс "
+          f"p95={np.percentile(latency_ms, 95):7.2f} мс p99={np.percentile(latency_ms, 99):7.2f} мс; "
+          f"{counters.get('bytes', 0) / 2 ** 20:.1f} МБ; статуси {statuses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Навантажувальний тест HTTP-сервісу VHI")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=100, help="запитів на клієнта")
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--spawn', action='store_true', help="запустити vhi_service.py у дочірньому процесі")
+    parser.add_argument('--data-dir', default='vhi_data')
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        service = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vhi_service.py')
+        server = subprocess.Popen([sys.executable, service, '--host', args.host,
+                                   '--port', str(args.port), '--data-dir', args.data_dir])
+    try:
+        asyncio.run(wait_ready(args.host, args.port))
+        for mode in args.modes:
+            latencies, counters, elapsed = asyncio.run(run_load(args.host, args.port, args.clients, args.requests,
+                                                                mode, args.batch_size, args.seed))
+            report(mode, args.clients, args.requests, args.batch_size, latencies, counters, elapsed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# Паралельне завантаження та аналітика VHI по областях у пулі процесів
+# Обробники не повертають DataFrame (їх довелося б серіалізувати): кожна область
+# записується у стовпцевий .npy-файл, а головний процес і обробники аналітики
+# читають його через memory-mapping. Результати збираються в порядку номерів
+# областей, тому не залежать від порядку завершення процесів.
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from lab2an import read_vhi_data, change_province_ids, read_all_provinces, apply_schema
+
+INT_COLUMNS = ['Рік', 'Тиждень']
+
+
+def list_province_files(data_dir='vhi_data'):
+    """Останній за часом файл кожної області: {province_id: шлях}, відсортовано за id."""
+    files = {}
+    for file_name in sorted(os.listdir(data_dir)):
+        if file_name.startswith('vhi_id_') and file_name.endswith('.csv'):
+            province_id = int(file_name.split('_')[2])
+            # у назві файлу час завантаження, тому пізніший файл іде останнім
+            files[province_id] = os.path.join(data_dir, file_name)
+    return dict(sorted(files.items()))
+
+
+def _parse_province(task):
+    province_id, file_path, out_dir, compact = task
+    df = read_vhi_data(file_path, compact=compact)
+    if df is None or 'VHI' not in df.columns:
+        return province_id, None, None
+    path = os.path.join(out_dir, f'{province_id}.npy')
+    np.save(path, df.to_numpy(dtype=float))
+    return province_id, path, list(df.columns)
+
+
+def _restore_types(df, compact=True):
+    # у .npy усі стовпці float64; повертаємо типи, які дав би read_vhi_data
+    if compact:
+        return apply_schema(df)
+    for col in INT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(int)
+    return df
+
+
+def _frame_from_columns(path, columns, compact=True):
+    values = np.load(path, mmap_mode='r')
+    return _restore_types(pd.DataFrame(np.array(values), columns=columns), compact)
+
+
+def read_all_provinces_parallel(data_dir='vhi_data', max_workers=None, compact=True):
+    """
+    Аналог read_all_provinces: розбір файлів областей виконується в пулі процесів.
+    Повертає словник {назва області: DataFrame} у порядку номерів областей.
+    """
+    files = list_province_files(data_dir)
+    province_data = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tasks = [(province_id, path, tmp_dir, compact) for province_id, path in files.items()]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_parse_province, tasks))
+        for province_id, path, columns in sorted(results):
+            if path is not None:
+                province_data[change_province_ids(province_id)] = _frame_from_columns(path, columns, compact)
+    return province_data
+
+
+class ColumnStore:
+    """
+    Стовпцеве сховище областей на диску: один .npy на область та index.json зі стовпцями.
+    Обробники пулу відкривають файли через mmap за шляхом, а не отримують DataFrame.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'index.json'), encoding='utf-8') as f:
+            index = json.load(f)
+        self.columns = index['columns']
+        self.files = index['files']
+
+    @classmethod
+    def from_province_data(cls, province_data, directory):
+        os.makedirs(directory, exist_ok=True)
+        # index.json зберігає один заголовок для всіх файлів - стовпці мають збігатися
+        columns = None
+        for province_name, df in province_data.items():
+            if columns is None:
+                columns = list(df.columns)
+            elif list(df.columns) != columns:
+                raise ValueError(f"Стовпці області {province_name} {list(df.columns)} "
+                                 f"відрізняються від спільних {columns}")
+        files = {}
+        for i, (province_name, df) in enumerate(province_data.items()):
+            file_name = f'province_{i}.npy'
+            np.save(os.path.join(directory, file_name), df.to_numpy(dtype=float))
+            files[province_name] = file_name
+        with open(os.path.join(directory, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump({'columns': columns, 'files': files}, f, ensure_ascii=False)
+        return cls(directory)
+
+    def path(self, province_name):
+        return os.path.join(self.directory, self.files[province_name])
+
+    def __contains__(self, province_name):
+        return province_name in self.files
+
+
+def _province_stats(task):
+    path, columns, years = task
+    values = np.load(path, mmap_mode='r')
+    year = values[:, columns.index('Рік')]
+    vhi = values[:, columns.index('VHI')][np.isin(year, years)]
+    vhi = vhi[~np.isnan(vhi)]
+    if len(vhi) == 0:
+        return None
+    return float(vhi.min()), float(vhi.max()), float(vhi.mean()), float(np.median(vhi))
+
+
+def find_extremes_parallel(store, province_names, years, max_workers=None):
+    """Аналог find_extremes по ColumnStore: статистика кожної області рахується в пулі процесів."""
+    names = [name for name in province_names if name in store]
+    tasks = [(store.path(name), store.columns, list(years)) for name in names]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        stats = list(executor.map(_province_stats, tasks))
+    results = [{
+        'Область': name,
+        'Мінімальний VHI': s[0],
+        'Максимальний VHI': s[1],
+        'Середній VHI': s[2],
+        'Медіана VHI': s[3],
+    } for name, s in zip(names, stats) if s is not None]
+    return pd.DataFrame(results)
+
+
+def _province_range(task):
+    name, path, columns, year_start, year_end = task
+    values = np.load(path, mmap_mode='r')
+    year = values[:, columns.index('Рік')]
+    mask = (year >= year_start) & (year <= year_end)
+    rows = values[mask][:, [columns.index('Рік'), columns.index('Тиждень'), columns.index('VHI')]]
+    return name, rows
+
+
+def get_vhi_for_years_range_parallel(store, province_names, year_start, year_end, max_workers=None):
+    """Аналог get_vhi_for_years_range по ColumnStore; результат у порядку province_names."""
+    tasks = [(name, store.path(name), store.columns, year_start, year_end)
+             for name in province_names if name in store]
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for name, rows in executor.map(_province_range, tasks):
+            if len(rows):
+                results[name] = _restore_types(pd.DataFrame(rows, columns=['Рік', 'Тиждень', 'VHI']))
+    return results
+
+
+if __name__ == "__main__":
+    # порівняння послідовного та паралельного завантаження вже завантажених файлів
+    started = time.perf_counter()
+    sequential = read_all_provinces()
+    sequential_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    parallel = read_all_provinces_parallel()
+    parallel_time = time.perf_counter() - started
+
+    print(f"Послідовно: {sequential_time:.2f} с, паралельно: {parallel_time:.2f} с, "
+          f"областей: {len(sequential)} / {len(parallel)}")
@@ -0,0 +1,118 @@
+# Запити top-k / bottom-k тижнів за VHI, VCI або TCI по всіх областях
+# Замість об'єднання таблиць і повного сортування (O(n log n)) використовується
+# часткова вибірка np.argpartition (O(n)) і сортування лише k знайдених записів.
+# Групування за областю, роком або десятиліттям: записи впорядковуються стабільним
+# сортуванням малих цілих кодів груп (для int8/int16 NumPy застосовує radix sort),
+# після чого argpartition виконується в межах кожної групи.
+# top_k_by_province не збирає спільних масивів: кандидати кожної області
+# об'єднуються через купу (heapq).
+#
+# Приклади:
+#   weeks = WeekTable.from_province_data(read_all_provinces())
+#   top_k(weeks, 50)                                  50 найпосушливіших тижнів (найменший VHI)
+#   top_k(weeks, 5, group_by='decade', largest=True)  5 найкращих тижнів кожного десятиліття
+import heapq
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+INDICES = ['VHI', 'VCI', 'TCI']
+GROUPS = ('province', 'year', 'decade')
+
+
+class WeekTable:
+    """Усі тижні всіх областей як стовпці: код області, рік, тиждень і показники."""
+
+    def __init__(self, provinces, province, year, week, values):
+        self.provinces = list(provinces)
+        self.province = province
+        self.year = year
+        self.week = week
+        self.values = values
+
+    @classmethod
+    def from_province_data(cls, province_data, indices=INDICES):
+        frames = list(province_data.values())
+        sizes = [len(df) for df in frames]
+        province = np.repeat(np.arange(len(frames), dtype=np.int16), sizes)
+        year = np.concatenate([df['Рік'].to_numpy(dtype=np.int16) for df in frames])
+        week = np.concatenate([df['Тиждень'].to_numpy(dtype=np.int8) for df in frames])
+        values = {index: np.concatenate([df[index].to_numpy(dtype=np.float32) for df in frames])
+                  for index in indices if all(index in df.columns for df in frames)}
+        return cls(province_data.keys(), province, year, week, values)
+
+    def __len__(self):
+        return len(self.year)
+
+    def group_codes(self, group_by):
+        if group_by == 'province':
+            return self.province
+        if group_by == 'year':
+            return self.year
+        if group_by == 'decade':
+            return (self.year // 10 * 10).astype(np.int16)
+        raise ValueError(f"Невідоме групування: {group_by}. Доступні: {', '.join(GROUPS)}")
+
+    def frame(self, rows, index, group_by=None):
+        result = pd.DataFrame({
+            'Область': [self.provinces[p] for p in self.province[rows]],
+            'Рік': self.year[rows],
+            'Тиждень': self.week[rows],
+            index: self.values[index][rows],
+        })
+        if group_by == 'decade':
+            result.insert(0, 'Десятиліття', self.year[rows] // 10 * 10)
+        return result
+
+
+def _select(values, rows, k):
+    """k рядків з найменшими values серед rows, упорядковані за значенням (NaN пропускаються)."""
+    rows = rows[~np.isnan(values[rows])]
+    if len(rows) > k:
+        rows = rows[np.argpartition(values[rows], k - 1)[:k]]
+    # порядок: значення, потім номер рядка - однаковий результат при однакових значеннях
+    return rows[np.lexsort((rows, values[rows]))]
+
+
+def top_k(table, k, index='VHI', largest=False, group_by=None):
+    """
+    k тижнів з найменшим (largest=False, посухи) або найбільшим значенням показника index,
+    для всіх даних або в кожній групі group_by ('province', 'year', 'decade').
+    """
+    if index not in table.values:
+        raise ValueError(f"Невідомий показник: {index}. Доступні: {', '.join(table.values)}")
+    values = -table.values[index] if largest else table.values[index]
+    if group_by is None:
+        return table.frame(_select(values, np.arange(len(table)), k), index)
+
+    codes = table.group_codes(group_by)
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+    rows = np.concatenate([_select(values, order[start:end], k) for start, end in zip(starts, ends)])
+    return table.frame(rows, index, group_by)
+
+
+def top_k_by_province(province_data, k, index='VHI', largest=False):
+    """
+    Загальний top-k без об'єднання таблиць: у кожній області відбираються k кандидатів
+    (argpartition), а потім k найкращих серед кандидатів вибираються з купи.
+    """
+    sign = -1 if largest else 1
+    candidates = []
+    for province_name, df in province_data.items():
+        values = df[index].to_numpy(dtype=np.float64) * sign
+        rows = _select(values, np.arange(len(values)), k)
+        year = df['Рік'].to_numpy()[rows]
+        week = df['Тиждень'].to_numpy()[rows]
+        candidates.append([(values[r], province_name, int(y), int(w)) for r, y, w in zip(rows, year, week)])
+    # кандидати кожної області вже відсортовані - об'єднання купою без повного сортування
+    best = list(islice(heapq.merge(*candidates), k))
+    return pd.DataFrame({
+        'Область': [item[1] for item in best],
+        'Рік': [item[2] for item in best],
+        'Тиждень': [item[3] for item in best],
+        index: [item[0] * sign for item in best],
+    })
@@ -0,0 +1,167 @@
+# Версійований набір даних VHI з LRU-кешем результатів запитів
+# Кожне оновлення даних (refresh, merge, set_province) збільшує version.
+# Ключ кешу - (функція, аргументи, version), тому результат, обчислений на старих даних,
+# ніколи не повертається; застарілі записи до того ж видаляються одразу при оновленні.
+# Кеш обмежений кількістю записів і сумарним розміром результатів (байти pandas).
+#
+# Використання:
+#   dataset = VHIDataset.from_directory('vhi_data')
+#   dataset.find_extremes(["Київська"], [2019, 2020])   # обчислення
+#   dataset.find_extremes(["Київська"], [2019, 2020])   # з кешу
+#   dataset.cache_info()
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from lab2an import (read_all_provinces, get_vhi_for_year, find_extremes, get_vhi_for_years_range,
+                    find_extreme_droughts_simple)
+
+
+def _freeze(value):
+    """Аргумент запиту у вигляді ключа словника: списки - кортежі, множини - відсортовані кортежі."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(item) for item in value))
+    return value
+
+
+def _result_size(result):
+    """Приблизний розмір результату запиту в байтах."""
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(index=True, deep=True).sum())
+    if isinstance(result, dict):
+        return sum(_result_size(value) for value in result.values()) + sys.getsizeof(result)
+    if isinstance(result, list):
+        return sum(_result_size(value) for value in result) + sys.getsizeof(result)
+    return sys.getsizeof(result)
+
+
+def _copy(result):
+    # кеш віддає копії, щоб зміна результату викликачем не зіпсувала кеш
+    if isinstance(result, pd.DataFrame):
+        return result.copy()
+    if isinstance(result, dict):
+        return {key: _copy(value) for key, value in result.items()}
+    if isinstance(result, list):
+        return [_copy(value) for value in result]
+    return result
+
+
+class VHIDataset:
+    """
+    Дані областей {назва: DataFrame} з номером версії та LRU-кешем запитів lab2an.
+    max_entries і max_bytes обмежують кеш; None - без обмеження.
+    """
+
+    def __init__(self, province_data=None, max_entries=256, max_bytes=64 * 2 ** 20):
+        self.province_data = dict(province_data or {})
+        self.version = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_directory(cls, data_dir='vhi_data', **kw):
+        return cls(read_all_provinces(data_dir), **kw)
+
+    # --- оновлення даних ---
+
+    def _bump(self):
+        self.version += 1
+        self.invalidations += len(self._cache)
+        self._cache.clear()
+        self._bytes = 0
+
+    def refresh(self, data_dir='vhi_data'):
+        """Перечитує всі області з каталогу."""
+        province_data = read_all_provinces(data_dir)
+        with self._lock:
+            self.province_data = province_data
+            self._bump()
+        return self
+
+    def merge(self, province_data):
+        """Додає або замінює таблиці областей."""
+        with self._lock:
+            # новий словник, щоб запити, які вже обчислюються, бачили незмінні дані
+            self.province_data = {**self.province_data, **province_data}
+            self._bump()
+        return self
+
+    def set_province(self, province_name, df):
+        return self.merge({province_name: df})
+
+    # --- кеш ---
+
+    def cached(self, func, *args, **kwargs):
+        """Результат func(province_data, *args, **kwargs) з кешу або обчислений і збережений."""
+        with self._lock:
+            key = (func.__name__, _freeze(args), _freeze(tuple(sorted(kwargs.items()))), self.version)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return _copy(self._cache[key][0])
+            self.misses += 1
+            province_data, version = self.province_data, self.version
+
+        result = func(province_data, *args, **kwargs)
+
+        with self._lock:
+            # дані могли оновитися під час обчислення - такий результат не кешується
+            if version == self.version:
+                size = _result_size(result)
+                if self.max_bytes is None or size <= self.max_bytes:
+                    self._cache[key] = (result, size)
+                    self._bytes += size
+                    self._evict()
+        return _copy(result)
+
+    def _evict(self):
+        while self._cache and ((self.max_entries is not None and len(self._cache) > self.max_entries)
+                               or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, (_, size) = self._cache.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+    def cache_info(self):
+        with self._lock:
+            return {
+                'version': self.version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._cache),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+    # --- запити lab2an ---
+
+    def get_vhi_for_year(self, province_name, year):
+        return self.cached(get_vhi_for_year, province_name, year)
+
+    def find_extremes(self, province_names, years):
+        return self.cached(find_extremes, province_names, years)
+
+    def get_vhi_for_years_range(self, province_names, year_start, year_end):
+        return self.cached(get_vhi_for_years_range, province_names, year_start, year_end)
+
+    def find_extreme_droughts_simple(self, threshold_percent=20, vhi_threshold=15, min_weeks=3):
+        return self.cached(find_extreme_droughts_simple, threshold_percent=threshold_percent,
+                           vhi_threshold=vhi_threshold, min_weeks=min_weeks)
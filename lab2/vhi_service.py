@@ -0,0 +1,292 @@
+# Локальний HTTP-сервіс запитів VHI на asyncio
+# Дані завантажуються один раз у VHIDataset (версія + LRU-кеш результатів), і всі клієнти
+# працюють з одним «теплим» набором даних замість розбору CSV у кожному процесі.
+#
+# Запити (GET, параметри у рядку запиту):
+#   /provinces                                    список областей
+#   /year?province=Київська&year=2020             ряд VHI за рік        (format=npy - бінарний .npy)
+#   /range?provinces=Київська,Одеська&start=2015&end=2020                (format=npy - .npz по областях)
+#   /extremes?provinces=Київська,Одеська&years=2018,2019,2020
+#   /drought?threshold_percent=20&vhi_threshold=15&min_weeks=3
+#   /stats                                        статистика кешу
+# POST /batch - JSON-список запитів [{"query": "year", "params": {...}}, ...], відповідь - список результатів.
+# POST /refresh - перечитати файли даних (збільшує версію, скидає кеш та ETag).
+#
+# Відповіді стискаються gzip, якщо клієнт це підтримує; ETag залежить від версії даних
+# і запиту, тож повторний запит з If-None-Match отримує 304 без обчислень.
+#
+# Запуск з каталогу lab2: python vhi_service.py --port 8050 --data-dir vhi_data
+import argparse
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from vhi_dataset import VHIDataset
+
+GZIP_MIN_BYTES = 1024
+MAX_BODY_BYTES = 10 * 2 ** 20
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class QueryError(Exception):
+    """Помилка в параметрах запиту (відповідь 400)."""
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _int(params, name, default=None):
+    value = params.get(name, default)
+    if value is None:
+        raise QueryError(f"Відсутній параметр: {name}")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise QueryError(f"Параметр {name} має бути цілим числом") from None
+
+
+def _float(params, name, default):
+    try:
+        return float(params.get(name, default))
+    except (TypeError, ValueError):
+        raise QueryError(f"Параметр {name} має бути числом") from None
+
+
+def _province(params):
+    value = params.get('province')
+    if value is None:
+        raise QueryError("Відсутній параметр: province")
+    if not isinstance(value, str):
+        raise QueryError("Параметр province - назва області (рядок)")
+    return value
+
+
+def _names(params, name):
+    value = params.get(name)
+    if value is None:
+        raise QueryError(f"Відсутній параметр: {name}")
+    if isinstance(value, str):
+        return _split(value)
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise QueryError(f"Параметр {name} - рядок через кому або список рядків")
+    return value
+
+
+def _years(params):
+    value = params.get('years')
+    if value is None:
+        raise QueryError("Відсутній параметр: years")
+    try:
+        return [int(year) for year in (_split(value) if isinstance(value, str) else value)]
+    except (TypeError, ValueError):
+        raise QueryError("Параметр years - список цілих чисел") from None
+
+
+def _frame_json(df):
+    # NaN -> null; типи NumPy -> числа JSON
+    return {col: [None if isinstance(v, float) and np.isnan(v) else v for v in df[col].tolist()]
+            for col in df.columns}
+
+
+def run_query(dataset, query, params):
+    """Виконує один запит; повертає результат, придатний для JSON."""
+    if query == 'provinces':
+        return list(dataset.province_data)
+    if query == 'year':
+        result = dataset.get_vhi_for_year(_province(params), _int(params, 'year'))
+        return None if result is None else _frame_json(result)
+    if query == 'range':
+        result = dataset.get_vhi_for_years_range(_names(params, 'provinces'), _int(params, 'start'),
+                                                 _int(params, 'end'))
+        return {name: _frame_json(df) for name, df in result.items()}
+    if query == 'extremes':
+        return _frame_json(dataset.find_extremes(_names(params, 'provinces'), _years(params)))
+    if query == 'drought':
+        result = dataset.find_extreme_droughts_simple(_float(params, 'threshold_percent', 20),
+                                                      _float(params, 'vhi_threshold', 15),
+                                                      _int(params, 'min_weeks', 3))
+        return [{'Рік': int(entry['Рік']), 'Області': entry['Області']} for entry in result or []]
+    if query == 'stats':
+        return dataset.cache_info()
+    raise QueryError(f"Невідомий запит: {query}")
+
+
+def run_query_binary(dataset, query, params):
+    """Числові результати year/range у форматі .npy/.npz (стовпці Рік, Тиждень, VHI як float64)."""
+    out = io.BytesIO()
+    if query == 'year':
+        result = dataset.get_vhi_for_year(_province(params), _int(params, 'year'))
+        np.save(out, np.empty((0, 2)) if result is None else result.to_numpy(dtype=np.float64))
+    elif query == 'range':
+        result = dataset.get_vhi_for_years_range(_names(params, 'provinces'), _int(params, 'start'),
+                                                 _int(params, 'end'))
+        np.savez(out, **{name: df.to_numpy(dtype=np.float64) for name, df in result.items()})
+    else:
+        raise QueryError("Бінарний формат підтримують лише запити year і range")
+    return out.getvalue()
+
+
+def run_batch(dataset, requests):
+    """Список запитів -> список {'result': ...} або {'error': ...} у тому ж порядку."""
+    if not isinstance(requests, list):
+        raise QueryError("Тіло /batch - JSON-список запитів")
+    responses = []
+    for request in requests:
+        try:
+            if not isinstance(request, dict):
+                raise QueryError("Запит пакета - об'єкт {'query': ..., 'params': {...}}")
+            params = request.get('params') or {}
+            if not isinstance(params, dict):
+                raise QueryError("Параметри запиту пакета - об'єкт {назва: значення}")
+            responses.append({'result': run_query(dataset, request.get('query'), params)})
+        except (QueryError, TypeError, ValueError) as e:
+            # помилка одного запиту не зриває решту пакета
+            responses.append({'error': str(e)})
+    return responses
+
+
+class VHIService:
+    def __init__(self, dataset, data_dir='vhi_data'):
+        self.dataset = dataset
+        self.data_dir = data_dir
+        self.requests = 0
+
+    def etag(self, target):
+        digest = hashlib.sha1(f"{self.dataset.version}:{target}".encode('utf-8')).hexdigest()[:20]
+        return f'W/"{digest}"'
+
+    async def handle_request(self, method, target, headers, body):
+        """Повертає (статус, заголовки, тіло)."""
+        url = urlsplit(target)
+        query = url.path.strip('/')
+        params = dict(parse_qsl(url.query))
+
+        if method == 'POST' and query in ('batch', 'refresh'):
+            if query == 'refresh':
+                await asyncio.to_thread(self.dataset.refresh, self.data_dir)
+                return 200, {}, {'version': self.dataset.version}
+            try:
+                requests = json.loads(body or b'null')
+            except ValueError:
+                raise QueryError("Некоректний JSON у тілі запиту") from None
+            return 200, {}, await asyncio.to_thread(run_batch, self.dataset, requests)
+        if method != 'GET':
+            return 405, {}, {'error': f"Метод {method} не підтримується для /{query}"}
+        if query not in ('provinces', 'year', 'range', 'extremes', 'drought', 'stats', 'health'):
+            return 404, {}, {'error': f"Невідомий шлях: {url.path}"}
+        if query == 'health':
+            return 200, {}, {'status': 'ok', 'version': self.dataset.version}
+        if query == 'stats':
+            return 200, {}, self.dataset.cache_info()
+
+        etag = self.etag(target)
+        cache_headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if etag in headers.get('if-none-match', ''):
+            return 304, cache_headers, b''
+        if params.get('format') == 'npy':
+            payload = await asyncio.to_thread(run_query_binary, self.dataset, query, params)
+            return 200, {**cache_headers, 'Content-Type': 'application/octet-stream'}, payload
+        return 200, cache_headers, await asyncio.to_thread(run_query, self.dataset, query, params)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = request_line.split(' ', 2)
+                except ValueError:
+                    await self.respond(writer, 400, {}, {'error': "Некоректний рядок запиту"}, False, {})
+                    break
+                headers = {}
+                for line in header_lines:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+                # рядок запиту в latin-1, а шлях і параметри - UTF-8 (percent-encoding декодує parse_qsl)
+                target = target.encode('latin-1').decode('utf-8', errors='replace')
+
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close')
+                if length < 0:
+                    # без коректної довжини тіла межа наступного запиту невідома - з'єднання закривається
+                    await self.respond(writer, 400, {}, {'error': "Некоректний Content-Length"}, False, headers)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {}, {'error': "Завелике тіло запиту"}, False, headers)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                self.requests += 1
+                try:
+                    status, extra, payload = await self.handle_request(method, target, headers, body)
+                except QueryError as e:
+                    status, extra, payload = 400, {}, {'error': str(e)}
+                except Exception as e:
+                    status, extra, payload = 500, {}, {'error': f"{type(e).__name__}: {e}"}
+                await self.respond(writer, status, extra, payload, keep_alive, headers)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def respond(self, writer, status, extra, payload, keep_alive, request_headers):
+        headers = {'Content-Type': 'application/json; charset=utf-8', **extra}
+        if isinstance(payload, bytes):
+            body = payload
+        else:
+            body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if len(body) >= GZIP_MIN_BYTES and 'gzip' in request_headers.get('accept-encoding', ''):
+            body = gzip.compress(body, compresslevel=5)
+            headers['Content-Encoding'] = 'gzip'
+            headers['Vary'] = 'Accept-Encoding'
+        headers['Content-Length'] = str(len(body))
+        headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+        head = f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items()) + '\r\n'
+        writer.write(head.encode('latin-1') + (body if status != 304 else b''))
+        await writer.drain()
+
+
+async def serve(dataset, host='127.0.0.1', port=8050, data_dir='vhi_data'):
+    service = VHIService(dataset, data_dir)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Сервіс VHI: http://{host}:{port} (областей: {len(dataset.province_data)})")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP-сервіс запитів VHI")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--data-dir', default='vhi_data')
+    parser.add_argument('--cache-entries', type=int, default=1024)
+    args = parser.parse_args()
+
+    dataset = VHIDataset.from_directory(args.data_dir, max_entries=args.cache_entries)
+    try:
+        asyncio.run(serve(dataset, args.host, args.port, args.data_dir))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
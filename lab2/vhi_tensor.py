@@ -0,0 +1,164 @@
+# Щільне представлення VHI: тензор (область × рік × тиждень × показник) float32
+# Відсутні тижні - NaN. Координати (назви областей, роки, тижні, показники) задають
+# відображення значень у індекси осей, тому запити lab2an зводяться до зрізів
+# і згорток по осях без перегляду рядків таблиць.
+#
+# Зберігається одним .npy (відкривається через mmap) та файлом координат .json поруч.
+#
+# Використання:
+#   tensor = VHITensor.from_province_data(read_all_provinces())
+#   tensor.save('vhi_tensor.npy'); tensor = VHITensor.load('vhi_tensor.npy')
+#   tensor.get_vhi_for_year('Київська', 2020)
+import json
+
+import numpy as np
+import pandas as pd
+
+INDEX_COLUMNS = ['SMN', 'SMT', 'VCI', 'TCI', 'VHI', 'Площа_VHI_менше_15', 'Площа_VHI_менше_35']
+
+
+class VHITensor:
+    """
+    values - масив (області, роки, тижні, показники); роки йдуть підряд від years[0],
+    тижні - від 1. Координати осей: provinces, years, weeks, indices.
+    """
+
+    def __init__(self, values, provinces, year_start, indices):
+        self.values = values
+        self.provinces = list(provinces)
+        self.indices = list(indices)
+        self.years = np.arange(year_start, year_start + values.shape[1])
+        self.weeks = np.arange(1, values.shape[2] + 1)
+        self._province_pos = {name: i for i, name in enumerate(self.provinces)}
+        self._index_pos = {name: i for i, name in enumerate(self.indices)}
+
+    @classmethod
+    def from_province_data(cls, province_data, indices=INDEX_COLUMNS):
+        """Будує тензор зі словника {область: DataFrame} (результат read_all_provinces)."""
+        provinces = list(province_data)
+        indices = [col for col in indices if all(col in df.columns for df in province_data.values())]
+        year_min = min(int(df['Рік'].min()) for df in province_data.values())
+        year_max = max(int(df['Рік'].max()) for df in province_data.values())
+        week_max = max(52, max(int(df['Тиждень'].max()) for df in province_data.values()))
+
+        values = np.full((len(provinces), year_max - year_min + 1, week_max, len(indices)), np.nan,
+                         dtype=np.float32)
+        for p, df in enumerate(province_data.values()):
+            year = df['Рік'].to_numpy(dtype=np.int64) - year_min
+            week = df['Тиждень'].to_numpy(dtype=np.int64) - 1
+            # при повторі тижня у файлі залишається останній рядок, як у таблиці
+            values[p, year, week] = df[indices].to_numpy(dtype=np.float32)
+        return cls(values, provinces, year_min, indices)
+
+    def save(self, path):
+        np.save(path, self.values)
+        with open(path + '.json', 'w', encoding='utf-8') as f:
+            json.dump({'provinces': self.provinces, 'year_start': int(self.years[0]),
+                       'indices': self.indices}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        with open(path + '.json', encoding='utf-8') as f:
+            coords = json.load(f)
+        values = np.load(path, mmap_mode='r' if mmap else None)
+        return cls(values, coords['provinces'], coords['year_start'], coords['indices'])
+
+    def __contains__(self, province_name):
+        return province_name in self._province_pos
+
+    def year_slice(self, year_start, year_end):
+        """Зріз осі років для діапазону [year_start, year_end], обрізаний межами даних."""
+        lo = max(year_start - self.years[0], 0)
+        hi = min(year_end - self.years[0] + 1, len(self.years))
+        return slice(int(lo), int(max(hi, lo)))
+
+    def series(self, province_name, index='VHI'):
+        """Матриця (роки, тижні) показника для області."""
+        return self.values[self._province_pos[province_name], :, :, self._index_pos[index]]
+
+    def compare(self, year, index='VHI'):
+        """Таблиця (області × тижні) показника за рік для порівняння областей."""
+        year_pos = year - self.years[0]
+        if not 0 <= year_pos < len(self.years):
+            return pd.DataFrame(index=self.provinces, columns=self.weeks, dtype=np.float32)
+        return pd.DataFrame(self.values[:, year_pos, :, self._index_pos[index]],
+                            index=self.provinces, columns=self.weeks)
+
+    def get_vhi_for_year(self, province_name, year):
+        """Як lab2an.get_vhi_for_year: тижні та VHI області за рік або None."""
+        if province_name not in self or not self.years[0] <= year <= self.years[-1]:
+            return None
+        vhi = self.series(province_name)[year - self.years[0]]
+        present = ~np.isnan(vhi)
+        if not present.any():
+            return None
+        return pd.DataFrame({'Тиждень': self.weeks[present], 'VHI': vhi[present]})
+
+    def find_extremes(self, province_names, years):
+        """Як lab2an.find_extremes: мінімум, максимум, середнє та медіана VHI за роки."""
+        year_pos = [year - self.years[0] for year in sorted(set(years))
+                    if self.years[0] <= year <= self.years[-1]]
+        names = [name for name in province_names if name in self]
+        if not names or not year_pos:
+            return pd.DataFrame()
+        # (області, вибрані роки × тижні) у float64
+        rows = [self._province_pos[name] for name in names]
+        block = self.values[rows][:, year_pos][..., self._index_pos['VHI']]
+        block = block.reshape(len(names), -1).astype(np.float64)
+        present = ~np.isnan(block).all(axis=1)
+        if not present.any():
+            return pd.DataFrame()
+        block = block[present]
+        return pd.DataFrame({
+            'Область': [name for name, keep in zip(names, present) if keep],
+            'Мінімальний VHI': np.nanmin(block, axis=1),
+            'Максимальний VHI': np.nanmax(block, axis=1),
+            'Середній VHI': np.nanmean(block, axis=1),
+            'Медіана VHI': np.nanmedian(block, axis=1)
+        })
+
+    def get_vhi_for_years_range(self, province_names, year_start, year_end):
+        """Як lab2an.get_vhi_for_years_range: {область: таблиця Рік, Тиждень, VHI}."""
+        years = self.year_slice(year_start, year_end)
+        year_grid, week_grid = np.meshgrid(self.years[years], self.weeks, indexing='ij')
+        results = {}
+        for province_name in province_names:
+            if province_name not in self:
+                continue
+            vhi = self.series(province_name)[years]
+            present = ~np.isnan(vhi)
+            if present.any():
+                results[province_name] = pd.DataFrame({'Рік': year_grid[present], 'Тиждень': week_grid[present],
+                                                       'VHI': vhi[present]})
+        return results
+
+    def drought_weeks(self, vhi_threshold=15):
+        """Кількість тижнів з VHI < vhi_threshold для кожної області та року, масив (області, роки)."""
+        return (self.values[..., self._index_pos['VHI']] < vhi_threshold).sum(axis=2)
+
+    def find_extreme_droughts_simple(self, threshold_percent=20, vhi_threshold=15, min_weeks=3):
+        """Як lab2an.find_extreme_droughts_simple: роки, коли посуха охопила понад threshold_percent% областей."""
+        affected = self.drought_weeks(vhi_threshold) >= min_weeks
+        threshold_count = len(self.provinces) * threshold_percent / 100
+        drought_years = [{
+            'Рік': int(self.years[year_pos]),
+            'Області': [self.provinces[p] for p in np.flatnonzero(affected[:, year_pos])]
+        } for year_pos in np.flatnonzero(affected.sum(axis=0) > threshold_count)]
+        return drought_years or None
+
+
+if __name__ == "__main__":
+    import time
+
+    from lab2an import read_all_provinces
+
+    started = time.perf_counter()
+    tensor = VHITensor.from_province_data(read_all_provinces())
+    tensor.save('vhi_tensor.npy')
+    print(f"Тензор {tensor.values.shape}, {tensor.values.nbytes / 2 ** 20:.1f} МБ: "
+          f"{time.perf_counter() - started:.2f} с")
+
+    started = time.perf_counter()
+    tensor = VHITensor.load('vhi_tensor.npy')
+    print(f"Завантаження з .npy: {(time.perf_counter() - started) * 1000:.2f} мс")
+    print(tensor.find_extremes(["Київська", "Львівська", "Одеська"], [2018, 2019, 2020]))
@@ -5,7 +5,6 @@ import datetime
 import numpy as np
 import re
 import streamlit as st
-import matplotlib.pyplot as plt
 
 def create_directory(dir_name='vhi_data'):
     if not os.path.exists(dir_name):
@@ -224,7 +223,8 @@ def streamlit_vhi_app():
             st.dataframe(filtered_df)
 
         with tab2:
-            # Графіки
+            # Графіки; matplotlib імпортується лише тут, щоб не сповільнювати запуск застосунку
+            import matplotlib.pyplot as plt
             fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
 
             # Перший графік: часовий ряд для обраної області
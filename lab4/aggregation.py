@@ -0,0 +1,352 @@
+# Агрегування хвилинних даних household_power_consumption за часом
+# Кожен запис отримує ключ - номер хвилини від 1970-01-01 (epoch-minute). За ключами:
+#   - згортки по годинах/добах/тижнях одним проходом (np.*.reduceat по відсортованих
+#     ключах або np.bincount для довільного порядку);
+#   - ковзні вікна за часом з O(1) на точку (кумулятивні суми та max/min за блоками ван Герка);
+#   - пошук піків споживання;
+#   - попередньо обчислені добові зведення (.npz), з яких тижневі та місячні
+#     звіти будуються без повторного проходу по ~2 млн сирих рядків.
+#
+# Використання:
+#   series = PowerSeries.from_numpy(load_data_numpy())
+#   hourly = series.resample('hour')
+#   summary = series.daily_summary(); summary.save('daily_summary.npz')
+import datetime as dt
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+POWER_COLUMNS = ['Global_active_power', 'Global_reactive_power', 'Voltage', 'Global_intensity',
+                 'Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+MINUTES = {'minute': 1, 'hour': 60, 'day': 1440}
+REDUCTIONS = ('sum', 'mean', 'min', 'max', 'count')
+# 1970-01-01 - четвер, тому тижні (з понеділка) зсунуті на 3 доби
+WEEK_SHIFT_DAYS = 3
+
+
+def epoch_minutes(dates, times):
+    """
+    Номери хвилин від 1970-01-01 для рядків дати 'd/m/yyyy' та часу 'HH:MM:SS'.
+    Дата розбирається лише там, де вона змінюється (записи йдуть підряд по днях),
+    час - векторно з кодів символів.
+    """
+    dates = np.asarray(dates)
+    times = np.asarray(times).astype('U8')
+    starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+    epoch = dt.date(1970, 1, 1)
+    run_days = np.array([(dt.datetime.strptime(str(dates[i]), '%d/%m/%Y').date() - epoch).days
+                         for i in starts], dtype=np.int64)
+    days = np.repeat(run_days, np.diff(np.r_[starts, len(dates)]))
+
+    digits = times.view(np.uint32).reshape(-1, 8).astype(np.int64) - ord('0')
+    minutes = (digits[:, 0] * 10 + digits[:, 1]) * 60 + digits[:, 3] * 10 + digits[:, 4]
+    return days * 1440 + minutes
+
+
+def minute_keys(data):
+    """Ключі epoch-minute для таблиці pandas (стовпець datetime або Date/Time) або масиву NumPy."""
+    if hasattr(data, 'columns') and 'datetime' in data.columns:
+        return data['datetime'].to_numpy().astype('datetime64[m]').astype(np.int64)
+    return epoch_minutes(np.asarray(data['Date']), np.asarray(data['Time']))
+
+
+def bucket_keys(minutes, freq):
+    """Номер інтервалу для кожної хвилини; freq - 'minute', 'hour', 'day', 'week' або кількість хвилин."""
+    if freq == 'week':
+        return (minutes // 1440 + WEEK_SHIFT_DAYS) // 7
+    return minutes // MINUTES.get(freq, freq)
+
+
+def bucket_start(keys, freq):
+    """Початок інтервалу (datetime64[m]) за його номером."""
+    if freq == 'week':
+        minutes = (keys * 7 - WEEK_SHIFT_DAYS) * 1440
+    else:
+        minutes = keys * MINUTES.get(freq, freq)
+    return minutes.astype('datetime64[m]')
+
+
+def bucket_reduce(keys, values, how='mean'):
+    """
+    Згортка values за ключами інтервалів. Повертає (унікальні ключі, результат).
+    Для відсортованих ключів - np.*.reduceat по межах інтервалів,
+    інакше - np.bincount (sum/mean/count) або np.*.at (min/max) за номерами груп.
+    """
+    if how not in REDUCTIONS:
+        raise ValueError(f"Невідома згортка: {how}. Доступні: {', '.join(REDUCTIONS)}")
+    keys = np.asarray(keys)
+    values = np.asarray(values)
+    if len(keys) == 0:
+        return keys, np.empty(0)
+
+    if np.all(keys[1:] >= keys[:-1]):
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        counts = np.diff(np.r_[starts, len(keys)])
+        unique = keys[starts]
+        if how == 'count':
+            return unique, counts
+        if how == 'min':
+            return unique, np.minimum.reduceat(values, starts)
+        if how == 'max':
+            return unique, np.maximum.reduceat(values, starts)
+        sums = np.add.reduceat(values, starts, dtype=np.float64)
+        return unique, sums if how == 'sum' else sums / counts
+
+    unique, groups = np.unique(keys, return_inverse=True)
+    if how in ('min', 'max'):
+        out = np.full(len(unique), np.inf if how == 'min' else -np.inf)
+        (np.minimum if how == 'min' else np.maximum).at(out, groups, values)
+        return unique, out
+    counts = np.bincount(groups, minlength=len(unique))
+    if how == 'count':
+        return unique, counts
+    sums = np.bincount(groups, weights=values, minlength=len(unique))
+    return unique, sums if how == 'sum' else sums / counts
+
+
+def sliding_extremum(values, window, how='max'):
+    """
+    Максимум/мінімум у вікні з window останніх елементів (для перших - по наявних).
+    Алгоритм ван Герка - Гіла - Вермана: префіксні та суфіксні екстремуми
+    блоків довжини window, по два порівняння на елемент незалежно від window.
+    """
+    op = np.maximum if how == 'max' else np.minimum
+    fill = -np.inf if how == 'max' else np.inf
+    n = len(values)
+    if window <= 1 or n == 0:
+        return np.asarray(values, dtype=np.float64).copy()
+    # спереду window-1 заповнювачів, щоб вікно для i закінчувалось на i
+    padded_len = -(-(n + window - 1) // window) * window
+    padded = np.full(padded_len, fill)
+    padded[window - 1:window - 1 + n] = values
+    blocks = padded.reshape(-1, window)
+    prefix = op.accumulate(blocks, axis=1).ravel()
+    suffix = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    # вікно [j, j + window - 1] у padded: суфікс блоку j та префікс блоку j + window - 1
+    return op(suffix[:n], prefix[window - 1:window - 1 + n])
+
+
+class PowerSeries:
+    """
+    Стовпці показників, впорядковані за часом, з ключами epoch-minute.
+    columns - словник {назва: масив}; рядки з пропусками мають бути вже відкинуті.
+    """
+
+    def __init__(self, minutes, columns):
+        minutes = np.asarray(minutes, dtype=np.int64)
+        order = None
+        if np.any(minutes[1:] < minutes[:-1]):
+            order = np.argsort(minutes, kind='stable')
+            minutes = minutes[order]
+        self.minutes = minutes
+        self.columns = {name: np.asarray(values) if order is None else np.asarray(values)[order]
+                        for name, values in columns.items()}
+
+    @classmethod
+    def from_numpy(cls, data, columns=POWER_COLUMNS):
+        return cls(minute_keys(data), {name: data[name] for name in columns})
+
+    @classmethod
+    def from_pandas(cls, df, columns=POWER_COLUMNS):
+        return cls(minute_keys(df), {name: df[name].to_numpy() for name in columns})
+
+    def __len__(self):
+        return len(self.minutes)
+
+    def resample(self, freq='hour', how='mean', columns=None):
+        """Таблиця згорток по інтервалах: start, count та стовпці показників."""
+        keys = bucket_keys(self.minutes, freq)
+        unique, counts = bucket_reduce(keys, keys, 'count')
+        result = {'start': bucket_start(unique, freq), 'count': counts}
+        for name in columns or self.columns:
+            result[name] = bucket_reduce(keys, self.columns[name], how)[1]
+        return pd.DataFrame(result)
+
+    def rolling(self, column, window, how='mean'):
+        """
+        Ковзне вікно за часом: для кожного запису - згортка по записах
+        за останні window хвилин (включно з поточною). Пропуски в даних враховуються.
+        """
+        values = self.columns[column]
+        if how in ('min', 'max'):
+            # розкладаємо значення на суцільну сітку хвилин, де відсутні хвилини нейтральні
+            offset = self.minutes - self.minutes[0]
+            grid = np.full(offset[-1] + 1, -np.inf if how == 'max' else np.inf)
+            grid[offset] = values
+            return sliding_extremum(grid, window, how)[offset]
+        starts = np.searchsorted(self.minutes, self.minutes - window + 1)
+        ends = np.arange(1, len(values) + 1)
+        counts = ends - starts
+        if how == 'count':
+            return counts
+        cumsum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+        sums = cumsum[ends] - cumsum[starts]
+        if how == 'sum':
+            return sums
+        if how == 'mean':
+            return sums / counts
+        raise ValueError(f"Невідома згортка: {how}. Доступні: {', '.join(REDUCTIONS)}")
+
+    def peaks(self, column, threshold=None, distance=60):
+        """
+        Піки показника: записи, які є максимумом у вікні ±distance хвилин
+        і не нижчі за threshold (за замовчуванням - середнє + 3 стандартні відхилення).
+        Повертає таблицю з часом і значенням піків.
+        """
+        values = self.columns[column]
+        if threshold is None:
+            threshold = values.mean(dtype=np.float64) + 3 * values.std(dtype=np.float64)
+        offset = self.minutes - self.minutes[0]
+        grid = np.full(offset[-1] + 1 + distance, -np.inf)
+        grid[offset] = values
+        # максимум у вікні, що закінчується на t + distance, - це вікно [t - distance, t + distance]
+        window_max = sliding_extremum(grid, 2 * distance + 1, 'max')[offset + distance]
+        candidates = np.flatnonzero((values >= threshold) & (values >= window_max))
+        # серед рівних значень на плато залишаємо перше
+        kept = []
+        last = None
+        for i in candidates:
+            if last is None or self.minutes[i] - self.minutes[last] > distance:
+                kept.append(i)
+                last = i
+        kept = np.array(kept, dtype=np.int64)
+        return pd.DataFrame({'time': self.minutes[kept].astype('datetime64[m]'), column: values[kept]})
+
+    def daily_summary(self, columns=None):
+        """Добове зведення (кількість, сума, мінімум, максимум кожного показника)."""
+        keys = bucket_keys(self.minutes, 'day')
+        days, counts = bucket_reduce(keys, keys, 'count')
+        tables = {'day': days.astype('datetime64[D]'), 'count': counts}
+        for name in columns or self.columns:
+            values = self.columns[name]
+            for how in ('sum', 'min', 'max'):
+                tables[f'{name}_{how}'] = bucket_reduce(keys, values, how)[1]
+        return DailySummary(tables)
+
+
+class DailySummary:
+    """
+    Попередньо обчислені добові агрегати. Тижневі та місячні звіти й вибірки за період
+    рахуються з добових рядків (≈1.4 тис. на 4 роки) замість сирих хвилинних записів.
+    """
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    @property
+    def columns(self):
+        return [key[:-len('_sum')] for key in self.tables if key.endswith('_sum')]
+
+    def save(self, path):
+        np.savez(path, **self.tables)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def between(self, start, end):
+        """Добові рядки з start по end включно (дати у форматі 'YYYY-MM-DD' або datetime64)."""
+        days = self.tables['day']
+        lo = np.searchsorted(days, np.datetime64(start, 'D'))
+        hi = np.searchsorted(days, np.datetime64(end, 'D'), side='right')
+        return DailySummary({key: values[lo:hi] for key, values in self.tables.items()})
+
+    def rollup(self, freq='month'):
+        """Зведення по тижнях ('week') або місяцях ('month') з добових рядків."""
+        days = self.tables['day']
+        if freq == 'month':
+            keys = days.astype('datetime64[M]').astype(np.int64)
+            start = keys.astype('datetime64[M]').astype('datetime64[D]')
+        elif freq == 'week':
+            keys = (days.astype(np.int64) + WEEK_SHIFT_DAYS) // 7
+            start = (keys * 7 - WEEK_SHIFT_DAYS).astype('datetime64[D]')
+        else:
+            raise ValueError(f"Невідомий інтервал: {freq}. Доступні: week, month")
+        unique, counts = bucket_reduce(keys, self.tables['count'], 'sum')
+        firsts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        tables = {'day': start[firsts], 'count': counts.astype(np.int64)}
+        for name in self.columns:
+            for how in ('sum', 'min', 'max'):
+                tables[f'{name}_{how}'] = bucket_reduce(keys, self.tables[f'{name}_{how}'], how)[1]
+        return DailySummary(tables)
+
+    def to_frame(self):
+        """Таблиця pandas із середніми, мінімумами та максимумами показників."""
+        frame = {'day': self.tables['day'], 'count': self.tables['count']}
+        for name in self.columns:
+            frame[f'{name}_mean'] = self.tables[f'{name}_sum'] / self.tables['count']
+            frame[f'{name}_min'] = self.tables[f'{name}_min']
+            frame[f'{name}_max'] = self.tables[f'{name}_max']
+        return pd.DataFrame(frame)
+
+
+class RollingWindow:
+    """
+    Ковзне вікно за часом для потоку записів: push() за O(1) амортизовано.
+    Сума ведеться інкрементно, мінімум і максимум - монотонними чергами.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.items = deque()
+        self.max_queue = deque()
+        self.min_queue = deque()
+        self.total = 0.0
+
+    def push(self, minute, value):
+        self.items.append((minute, value))
+        self.total += value
+        while self.max_queue and self.max_queue[-1][1] <= value:
+            self.max_queue.pop()
+        self.max_queue.append((minute, value))
+        while self.min_queue and self.min_queue[-1][1] >= value:
+            self.min_queue.pop()
+        self.min_queue.append((minute, value))
+
+        oldest = minute - self.window + 1
+        while self.items[0][0] < oldest:
+            self.total -= self.items.popleft()[1]
+        while self.max_queue[0][0] < oldest:
+            self.max_queue.popleft()
+        while self.min_queue[0][0] < oldest:
+            self.min_queue.popleft()
+        return self
+
+    @property
+    def count(self):
+        return len(self.items)
+
+    @property
+    def mean(self):
+        return self.total / len(self.items)
+
+    @property
+    def max(self):
+        return self.max_queue[0][1]
+
+    @property
+    def min(self):
+        return self.min_queue[0][1]
+
+
+if __name__ == "__main__":
+    import time
+
+    from lab4 import load_data_numpy
+
+    data = load_data_numpy()
+    started = time.perf_counter()
+    series = PowerSeries.from_numpy(data)
+    summary = series.daily_summary()
+    print(f"Добове зведення з {len(series)} записів: {(time.perf_counter() - started) * 1000:.1f} мс")
+    summary.save('daily_summary.npz')
+
+    print("\nСередні по годинах:")
+    print(series.resample('hour').head())
+    print("\nПо місяцях (з добового зведення):")
+    print(summary.rollup('month').to_frame()[['day', 'count', 'Global_active_power_mean',
+                                                'Global_active_power_max']].head())
+    print("\nПіки загальної активної потужності:")
+    print(series.peaks('Global_active_power', distance=24 * 60).head())
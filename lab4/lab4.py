@@ -4,19 +4,49 @@ import timeit
 import datetime as dt
 import re
 
+from sampling import sample_means
+from parallel_scan import thread_scaling_report
+from sorted_index import index_report
+from zone_maps import zone_map_report
+
 # Функції для профілювання часу виконання
 def profile_execution(func, repeats=5):
     """Вимірює час виконання функції"""
     time_taken = timeit.timeit(func, number=repeats) / repeats
     return time_taken * 1000  # Повертає час у мілісекундах
 
+# Компактна схема числових стовпців: показники лічильника мають 3 знаки після коми,
+# тому float32 достатньо, а пам'ять зменшується вдвічі порівняно з float64
+POWER_SCHEMA = {
+    'Global_active_power': 'float32',
+    'Global_reactive_power': 'float32',
+    'Voltage': 'float32',
+    'Global_intensity': 'float32',
+    'Sub_metering_1': 'float32',
+    'Sub_metering_2': 'float32',
+    'Sub_metering_3': 'float32'
+}
+
+def memory_report(before, after):
+    """Порівнює пам'ять стовпців (байти) двох таблиць pandas або структурованих масивів NumPy."""
+    def usage(data):
+        if hasattr(data, 'columns'):
+            return data.memory_usage(index=False, deep=True)
+        return pd.Series({name: data[name].nbytes for name in data.dtype.names})
+
+    report = pd.DataFrame({'до, байт': usage(before), 'після, байт': usage(after)})
+    report.loc['Разом'] = report.sum()
+    report['коефіцієнт'] = report['до, байт'] / report['після, байт']
+    return report
+
 # Завантаження та підготовка даних через pandas
-def load_data_pandas():
-    # Завантаження даних
+def load_data_pandas(compact=True):
+    # Завантаження даних; типи стовпців задаються одразу під час розбору
     df = pd.read_csv("household_power_consumption.txt", sep=';', 
                     parse_dates={'datetime': ['Date', 'Time']},
                     dayfirst=True,
-                    na_values=['?'])
+                    na_values=['?'],
+                    dtype=POWER_SCHEMA if compact else None)
     
     # Видалення рядків з відсутніми значеннями
     df = df.dropna()
@@ -24,12 +54,13 @@ def load_data_pandas():
     return df
 
 # Завантаження та підготовка даних через numpy
-def load_data_numpy():
+def load_data_numpy(compact=True):
     # Визначення типів даних для колонок
-    types = [("Date", "U10"), ("Time", "U8"), ("Global_active_power", "f8"), 
-             ("Global_reactive_power", "f8"), ("Voltage", "f8"), 
-             ("Global_intensity", "f8"), ("Sub_metering_1", "f8"), 
-             ("Sub_metering_2", "f8"), ("Sub_metering_3", "f8")]
+    value_type = "f4" if compact else "f8"
+    types = [("Date", "U10"), ("Time", "U8"), ("Global_active_power", value_type), 
+             ("Global_reactive_power", value_type), ("Voltage", value_type), 
+             ("Global_intensity", value_type), ("Sub_metering_1", value_type), 
+             ("Sub_metering_2", value_type), ("Sub_metering_3", value_type)]
     
     # Завантаження даних
     data = np.genfromtxt("household_power_consumption.txt", delimiter=';', 
@@ -64,21 +95,11 @@ def task3_pandas(df):
     filtered_df = df[(df['Global_intensity'] >= 19) & (df['Global_intensity'] <= 20)]
     return filtered_df[filtered_df['Sub_metering_2'] > filtered_df['Sub_metering_3']]
 
-def task4_pandas(df):
+def task4_pandas(df, seed=None):
     """Обрати випадковим чином 500000 записів (без повторів елементів вибірки),
     для них обчислити середні величини усіх 3-х груп споживання електричної енергії."""
-    # Перевірка, чи достатньо записів
-    sample_size = min(500000, len(df))
-    sample_df = df.sample(n=sample_size, replace=False)
-    
-    # Обчислення середніх значень
-    mean_values = {
-        'Sub_metering_1': sample_df['Sub_metering_1'].mean(),
-        'Sub_metering_2': sample_df['Sub_metering_2'].mean(),
-        'Sub_metering_3': sample_df['Sub_metering_3'].mean()
-    }
-    
-    return mean_values
+    # Вибираються лише індекси, а з таблиці беруться тільки три стовпці груп споживання
+    return sample_means(df, 500000, seed=seed)
 
 def task5_pandas(df):
     """Обрати ті записи, які після 18-00 споживають понад 6 кВт за хвилину в середньому,
@@ -133,24 +154,12 @@ def task3_numpy(data):
     filtered_data = data[intensity_mask]
     return filtered_data[filtered_data['Sub_metering_2'] > filtered_data['Sub_metering_3']]
 
-def task4_numpy(data):
+def task4_numpy(data, seed=None):
     """Обрати випадковим чином 500000 записів (без повторів елементів вибірки),
     для них обчислити середні величини усіх 3-х груп споживання електричної енергії."""
-    # Перевірка, чи достатньо записів
-    sample_size = min(500000, len(data))
-    
-    # Вибір випадкових індексів без повторень
-    indices = np.random.choice(len(data), size=sample_size, replace=False)
-    sample_data = data[indices]
-    
-    # Обчислення середніх значень
-    mean_values = {
-        'Sub_metering_1': np.mean(sample_data['Sub_metering_1']),
-        'Sub_metering_2': np.mean(sample_data['Sub_metering_2']),
-        'Sub_metering_3': np.mean(sample_data['Sub_metering_3'])
-    }
-    
-    return mean_values
+    # Вибір випадкових індексів без повторень (без перестановки всього індексу),
+    # збирання лише полів груп споживання замість повних записів
+    return sample_means(data, 500000, seed=seed)
 
 def task5_numpy(data):
     """Обрати ті записи, які після 18-00 споживають понад 6 кВт за хвилину в середньому,
@@ -317,9 +326,25 @@ def main():
     
     print(f"\nРозмір даних Pandas: {len(pandas_df)} рядків")
     print(f"Розмір даних NumPy: {len(numpy_data)} рядків")
+
+    # Пам'ять у компактній схемі порівняно з float64 для всіх числових стовпців
+    print("\nПам'ять Pandas (float64 -> float32):")
+    print(memory_report(pandas_df.astype({col: 'float64' for col in POWER_SCHEMA}), pandas_df))
+    print("\nПам'ять NumPy (f8 -> f4):")
+    wide_types = [(name, 'f8' if name in POWER_SCHEMA else numpy_data.dtype[name]) for name in numpy_data.dtype.names]
+    print(memory_report(numpy_data.astype(wide_types), numpy_data))
     
     # Проведення аналізу та порівняння
     evaluate_and_report(pandas_df, numpy_data)
 
+    # Масштабування завдань 1-3 за кількістю потоків
+    thread_scaling_report(numpy_data)
+
+    # Завдання 1-3 через відсортовані індекси замість повного сканування
+    index_report(numpy_data, {'task1': task1_numpy, 'task2': task2_numpy, 'task3': task3_numpy})
+
+    # task5 з відкиданням блоків за зонною картою
+    zone_map_report(numpy_data)
+
 if __name__ == "__main__":
     main()
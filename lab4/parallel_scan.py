@@ -0,0 +1,130 @@
+# Блочно-паралельне виконання фільтрів завдань 1-3 у пулі потоків
+# Порівняння NumPy відпускають GIL, тому блоки стовпців (за замовчуванням 64 тис. рядків,
+# щоб стовпці блоку вміщалися в кеш L2) обробляються потоками одночасно. Кожен блок
+# повертає індекси вибраних рядків зі зсувом початку блоку; блоки об'єднуються в
+# початковому порядку, тому результат збігається з послідовною фільтрацією.
+#
+# Стовпці структурованого масиву NumPy розміщені з кроком у цілий запис (~100 байтів),
+# тому перед скануванням потрібні стовпці копіюються в суцільні масиви (column_store).
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+BLOCK_ROWS = 2 ** 16
+
+
+def column_store(data, names):
+    """Суцільні копії стовпців структурованого масиву або таблиці pandas: {назва: масив}."""
+    if hasattr(data, 'columns'):
+        return {name: np.ascontiguousarray(data[name].to_numpy()) for name in names}
+    return {name: np.ascontiguousarray(data[name]) for name in names}
+
+
+# Предикати завдань над блоком стовпців (словник зрізів)
+def task1_mask(block):
+    return block['Global_active_power'] > 5
+
+
+def task2_mask(block):
+    return block['Voltage'] > 235
+
+
+def task3_mask(block):
+    intensity = block['Global_intensity']
+    mask = intensity >= 19
+    mask &= intensity <= 20
+    mask &= block['Sub_metering_2'] > block['Sub_metering_3']
+    return mask
+
+
+TASKS = {
+    'task1': (task1_mask, ['Global_active_power']),
+    'task2': (task2_mask, ['Voltage']),
+    'task3': (task3_mask, ['Global_intensity', 'Sub_metering_2', 'Sub_metering_3']),
+}
+
+
+class BlockScanner:
+    """Пул потоків для блочного сканування стовпців; threads=1 - послідовно в поточному потоці."""
+
+    def __init__(self, threads=None, block_rows=BLOCK_ROWS):
+        self.threads = threads or os.cpu_count() or 1
+        self.block_rows = block_rows
+        self.executor = ThreadPoolExecutor(self.threads) if self.threads > 1 else None
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _map(self, func, columns):
+        n = len(next(iter(columns.values())))
+        starts = range(0, n, self.block_rows)
+
+        def run(start):
+            stop = min(start + self.block_rows, n)
+            return func({name: values[start:stop] for name, values in columns.items()}, start)
+
+        if self.executor is None:
+            return [run(start) for start in starts]
+        # map повертає результати в порядку блоків незалежно від порядку завершення
+        return list(self.executor.map(run, starts))
+
+    def select(self, predicate, columns):
+        """Індекси рядків, для яких predicate(блок) істинний, у зростаючому порядку."""
+        parts = self._map(lambda block, start: np.flatnonzero(predicate(block)) + start, columns)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+    def count(self, predicate, columns):
+        """Кількість рядків, для яких predicate(блок) істинний."""
+        return int(sum(self._map(lambda block, start: np.count_nonzero(predicate(block)), columns)))
+
+
+def run_task(scanner, task, columns, data=None):
+    """
+    Виконує завдання 1-3 блочно. Без data повертає індекси вибраних рядків,
+    з data - самі записи (як task*_numpy / task*_pandas).
+    """
+    predicate, _ = TASKS[task]
+    indices = scanner.select(predicate, columns)
+    if data is None:
+        return indices
+    return data.iloc[indices] if hasattr(data, 'iloc') else data[indices]
+
+
+def thread_scaling_report(data, thread_counts=None, repeats=5, block_rows=BLOCK_ROWS):
+    """
+    Час завдань 1-3 (лише маски та індекси) для різної кількості потоків.
+    Повертає {завдання: {потоки: мс}} і друкує таблицю з прискоренням відносно першої кількості потоків.
+    """
+    if thread_counts is None:
+        cpus = os.cpu_count() or 1
+        thread_counts = sorted({t for t in (1, 2, 4, 8, 16) if t <= cpus} | {cpus})
+    names = sorted({name for _, task_columns in TASKS.values() for name in task_columns})
+    columns = column_store(data, names)
+
+    results = {}
+    for threads in thread_counts:
+        with BlockScanner(threads, block_rows) as scanner:
+            for task, (predicate, _) in TASKS.items():
+                times = []
+                for _ in range(repeats):
+                    started = time.perf_counter()
+                    scanner.select(predicate, columns)
+                    times.append(time.perf_counter() - started)
+                results.setdefault(task, {})[threads] = min(times) * 1000
+
+    print(f"\nБлочно-паралельне сканування ({len(data)} рядків, блок {block_rows} рядків):")
+    print(f"{'завдання':<10}" + ''.join(f"{f'{t} потоків':>22}" for t in thread_counts))
+    for task, by_threads in results.items():
+        base = by_threads[thread_counts[0]]
+        cells = ''.join(f"{ms:>10.3f} мс (x{base / ms:4.2f})" for ms in by_threads.values())
+        print(f"{task:<10}{cells}")
+    return results
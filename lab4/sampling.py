@@ -0,0 +1,98 @@
+# Випадкова вибірка записів без повторень для завдання 4
+# Замість перестановки всього індексу (np.random.choice) та копіювання повних записів:
+#   - індекси вибираються np.random.Generator.choice(replace=False, shuffle=False)
+#     і сортуються, щоб читання стовпців ішло послідовно в пам'яті;
+#   - з таблиці беруться лише потрібні стовпці за цими індексами;
+#   - для даних, що надходять порціями (pd.read_csv(..., chunksize=...)), є
+#     резервуарна вибірка (алгоритм R), векторизована по порції.
+# Однаковий seed дає однакову вибірку.
+import numpy as np
+
+SUB_METERING = ['Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+
+
+def sample_indices(n, size, seed=None):
+    """size різних індексів з range(n) у зростаючому порядку."""
+    rng = np.random.default_rng(seed)
+    indices = rng.choice(n, size=min(size, n), replace=False, shuffle=False)
+    indices.sort()
+    return indices
+
+
+def _column(data, name):
+    # таблиця pandas, структурований масив NumPy або словник стовпців
+    return data[name].to_numpy() if hasattr(data, 'columns') else data[name]
+
+
+def sample_columns(data, size, columns=SUB_METERING, seed=None):
+    """Вибірка size записів без повторень; повертає {стовпець: масив} лише для columns."""
+    indices = sample_indices(len(data), size, seed)
+    return {name: _column(data, name)[indices] for name in columns}
+
+
+def sample_means(data, size, columns=SUB_METERING, seed=None):
+    """Середні значення стовпців columns у випадковій вибірці size записів без повторень."""
+    sample = sample_columns(data, size, columns, seed)
+    return {name: values.mean(dtype=np.float64) for name, values in sample.items()}
+
+
+class ReservoirSampler:
+    """
+    Резервуарна вибірка фіксованого розміру з потоку порцій (алгоритм R):
+    після обробки n записів кожен з них потрапляє у вибірку з імовірністю size / n.
+    Зберігаються лише стовпці columns.
+    """
+
+    def __init__(self, size, columns=SUB_METERING, seed=None):
+        self.size = size
+        self.columns = list(columns)
+        self.rng = np.random.default_rng(seed)
+        self.seen = 0
+        self.reservoir = None
+
+    def update(self, chunk):
+        """Додає порцію (таблиця pandas, структурований масив або словник стовпців)."""
+        values = {name: np.asarray(_column(chunk, name)) for name in self.columns}
+        n = len(values[self.columns[0]])
+        if n == 0:
+            return self
+        if self.reservoir is None:
+            self.reservoir = {name: np.empty(self.size, dtype=column.dtype) for name, column in values.items()}
+
+        # перші size записів потоку заповнюють резервуар без заміни
+        fill = min(max(self.size - self.seen, 0), n)
+        for name, column in values.items():
+            self.reservoir[name][self.seen:self.seen + fill] = column[:fill]
+
+        # запис з номером i (від 0) замінює випадкову позицію j <= i, якщо j < size
+        positions = np.arange(self.seen + fill, self.seen + n)
+        if len(positions):
+            slots = self.rng.integers(0, positions + 1)
+            taken = slots < self.size
+            slots, rows = slots[taken], np.flatnonzero(taken) + fill
+            # при повторі позиції перемагає пізніший запис, як у послідовному алгоритмі
+            slots, last = np.unique(slots[::-1], return_index=True)
+            rows = rows[::-1][last]
+            for name, column in values.items():
+                self.reservoir[name][slots] = column[rows]
+
+        self.seen += n
+        return self
+
+    def sample(self):
+        """Поточна вибірка: {стовпець: масив} довжиною min(size, кількість записів)."""
+        if self.reservoir is None:
+            return {name: np.empty(0) for name in self.columns}
+        count = min(self.size, self.seen)
+        return {name: values[:count] for name, values in self.reservoir.items()}
+
+    def means(self):
+        return {name: values.mean(dtype=np.float64) for name, values in self.sample().items()}
+
+
+def reservoir_sample_means(chunks, size, columns=SUB_METERING, seed=None):
+    """Середні стовпців у резервуарній вибірці з ітератора порцій."""
+    sampler = ReservoirSampler(size, columns, seed)
+    for chunk in chunks:
+        sampler.update(chunk)
+    return sampler.means()
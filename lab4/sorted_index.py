@@ -0,0 +1,143 @@
+# Відсортовані вторинні індекси стовпців для порогових запитів (завдання 1-3)
+# Індекс стовпця - перестановка argsort і відсортовані значення; будується один раз
+# після завантаження. Умови «> поріг», «<= поріг» і «між a та b» розв'язуються двома
+# searchsorted за O(log n) і дають діапазон позицій у перестановці - номери рядків
+# без перегляду всього стовпця та без булевої маски. Кількість рядків відома одразу.
+#
+# Використання:
+#   indexes = build_indexes(load_data_numpy())
+#   task1_indexed(data, indexes)                       те саме, що task1_numpy(data)
+#   indexes['Voltage'].between(230, 240).count
+import time
+
+import numpy as np
+
+INDEXED_COLUMNS = ['Global_active_power', 'Voltage', 'Global_intensity']
+
+
+class RowRange:
+    """Діапазон [start, stop) у перестановці індексу - набір номерів рядків без копіювання."""
+
+    def __init__(self, index, start, stop):
+        self.index = index
+        self.start = start
+        self.stop = stop
+
+    @property
+    def count(self):
+        return self.stop - self.start
+
+    def __len__(self):
+        return self.count
+
+    def rows(self, ordered=True):
+        """Номери рядків; ordered=True - у порядку таблиці (як після булевої маски)."""
+        rows = self.index.order[self.start:self.stop]
+        return np.sort(rows) if ordered else rows
+
+    def values(self):
+        """Значення індексованого стовпця в діапазоні (за зростанням)."""
+        return self.index.sorted_values[self.start:self.stop]
+
+
+class SortedIndex:
+    def __init__(self, values):
+        values = np.asarray(values)
+        self.order = np.argsort(values, kind='stable')
+        self.sorted_values = values[self.order]
+
+    def __len__(self):
+        return len(self.order)
+
+    def between(self, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        """Рядки зі значенням між low і high (None - без межі)."""
+        start = 0 if low is None else int(np.searchsorted(self.sorted_values, low,
+                                                          side='left' if low_inclusive else 'right'))
+        stop = len(self) if high is None else int(np.searchsorted(self.sorted_values, high,
+                                                                  side='right' if high_inclusive else 'left'))
+        return RowRange(self, start, max(start, stop))
+
+    def greater(self, threshold):
+        return self.between(threshold, None, low_inclusive=False)
+
+    def greater_equal(self, threshold):
+        return self.between(threshold, None)
+
+    def less(self, threshold):
+        return self.between(None, threshold, high_inclusive=False)
+
+    def less_equal(self, threshold):
+        return self.between(None, threshold)
+
+
+def build_indexes(data, columns=INDEXED_COLUMNS):
+    """Індекси стовпців структурованого масиву NumPy або таблиці pandas: {назва: SortedIndex}."""
+    if hasattr(data, 'columns'):
+        return {name: SortedIndex(data[name].to_numpy()) for name in columns}
+    return {name: SortedIndex(data[name]) for name in columns}
+
+
+def intersect(*ranges):
+    """
+    Номери рядків, що входять в усі діапазони (у порядку таблиці).
+    Починаємо з найменшого діапазону, інші перевіряються по відсортованих номерах.
+    """
+    ranges = sorted(ranges, key=len)
+    rows = ranges[0].rows()
+    for other in ranges[1:]:
+        rows = np.intersect1d(rows, other.rows(ordered=False), assume_unique=True)
+    return rows
+
+
+def _take(data, rows):
+    return data.iloc[rows] if hasattr(data, 'iloc') else data[rows]
+
+
+def _column(data, name):
+    return data[name].to_numpy() if hasattr(data, 'columns') else data[name]
+
+
+def task1_indexed(data, indexes, threshold=5):
+    """Записи з Global_active_power > threshold через індекс (як task1_*)."""
+    return _take(data, indexes['Global_active_power'].greater(threshold).rows())
+
+
+def task2_indexed(data, indexes, threshold=235):
+    """Записи з Voltage > threshold через індекс (як task2_*)."""
+    return _take(data, indexes['Voltage'].greater(threshold).rows())
+
+
+def task3_indexed(data, indexes, low=19, high=20):
+    """
+    Сила струму в межах [low, high] - діапазон індексу; умова Sub_metering_2 > Sub_metering_3
+    перевіряється лише для рядків цього діапазону (як task3_*).
+    """
+    rows = indexes['Global_intensity'].between(low, high).rows()
+    rows = rows[_column(data, 'Sub_metering_2')[rows] > _column(data, 'Sub_metering_3')[rows]]
+    return _take(data, rows)
+
+
+def index_report(data, scan_tasks, repeats=5):
+    """
+    Час побудови індексів і завдань 1-3 через індекси порівняно з повним скануванням.
+    scan_tasks - {назва: функція(data)}, наприклад {'task1': task1_numpy, ...}.
+    """
+    started = time.perf_counter()
+    indexes = build_indexes(data)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"\nВідсортовані індекси {', '.join(INDEXED_COLUMNS)}: побудова {build_ms:.1f} мс")
+
+    indexed_tasks = {'task1': task1_indexed, 'task2': task2_indexed, 'task3': task3_indexed}
+    results = {}
+    for task, scan in scan_tasks.items():
+        scan_ms = min(_timed(lambda: scan(data)) for _ in range(repeats))
+        index_ms = min(_timed(lambda: indexed_tasks[task](data, indexes)) for _ in range(repeats))
+        results[task] = (scan_ms, index_ms)
+        print(f"{task}: сканування {scan_ms:8.3f} мс, індекс {index_ms:8.3f} мс (x{scan_ms / index_ms:.1f})")
+    return indexes, results
+
+
+def _timed(func):
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
@@ -0,0 +1,173 @@
+# Зонні карти (zone maps) для вибіркових фільтрів над хвилинними даними
+# Таблиця ділиться на блоки фіксованого розміру (за замовчуванням 1024 рядки - близько доби).
+# Для кожного блоку під час завантаження зберігаються мінімум і максимум кожного стовпця,
+# межі часу (epoch-minute) та маска годин доби, що трапляються в блоці (24 біти).
+# Планувальник фільтра за цими зведеннями відкидає блоки, в яких умова не може
+# виконатися, і перевіряє умови лише в решті блоків, тому вибіркові запити
+# (вечір і > 6 кВт у task5) працюють пропорційно до кількості придатних блоків.
+#
+# Умова - кортеж (стовпець, оператор, значення), де значення - число або назва іншого стовпця:
+#   ('hour', '>=', 18), ('Global_active_power', '>', 6), ('Sub_metering_2', '>', 'Sub_metering_1')
+# Стовпці: показники POWER_COLUMNS, 'minute' (epoch-minute) і 'hour' (година доби).
+#
+# Використання:
+#   zones = ZoneMap.build(load_data_numpy())
+#   rows = zones.select(TASK5_PREDICATES)            номери рядків у порядку таблиці
+#   task5_zoned(data, zones)                         те саме, що task5_numpy(data)
+import time
+
+import numpy as np
+
+from aggregation import POWER_COLUMNS, minute_keys
+
+BLOCK_ROWS = 1024
+OPERATORS = {'>': np.greater, '>=': np.greater_equal, '<': np.less, '<=': np.less_equal, '==': np.equal}
+HOURS = np.arange(24)
+
+TASK5_PREDICATES = [
+    ('hour', '>=', 18),
+    ('Global_active_power', '>', 6),
+    ('Sub_metering_2', '>', 'Sub_metering_1'),
+    ('Sub_metering_2', '>', 'Sub_metering_3'),
+]
+
+
+def _block_may_match(low, high, op, other_low, other_high):
+    """Чи може в блоці виконатися a op b, якщо a у [low, high], а b у [other_low, other_high]."""
+    if op == '>':
+        return high > other_low
+    if op == '>=':
+        return high >= other_low
+    if op == '<':
+        return low < other_high
+    if op == '<=':
+        return low <= other_high
+    if op == '==':
+        return (low <= other_high) & (high >= other_low)
+    raise ValueError(f"Невідомий оператор: {op}. Доступні: {', '.join(OPERATORS)}")
+
+
+class ZoneMap:
+    """
+    Суцільні стовпці таблиці та зведення по блоках:
+    low/high - {стовпець: мінімуми/максимуми блоків}, hour_bits - маски годин блоків.
+    """
+
+    def __init__(self, columns, block_rows=BLOCK_ROWS):
+        self.columns = columns
+        self.block_rows = block_rows
+        self.rows = len(columns['minute'])
+        self.starts = np.arange(0, self.rows, block_rows)
+        self.low = {}
+        self.high = {}
+        for name, values in columns.items():
+            if name == 'hour':
+                continue
+            self.low[name] = np.minimum.reduceat(values, self.starts)
+            self.high[name] = np.maximum.reduceat(values, self.starts)
+        self.hour_bits = np.bitwise_or.reduceat(np.left_shift(1, columns['hour'], dtype=np.int32), self.starts)
+
+    @classmethod
+    def build(cls, data, block_rows=BLOCK_ROWS, columns=POWER_COLUMNS):
+        """Зонна карта для структурованого масиву NumPy або таблиці pandas (після dropna)."""
+        minutes = minute_keys(data)
+        if hasattr(data, 'columns'):
+            store = {name: np.ascontiguousarray(data[name].to_numpy()) for name in columns}
+        else:
+            store = {name: np.ascontiguousarray(data[name]) for name in columns}
+        store['minute'] = minutes
+        store['hour'] = (minutes % 1440 // 60).astype(np.int8)
+        return cls(store, block_rows)
+
+    @property
+    def blocks(self):
+        return len(self.starts)
+
+    def nbytes(self):
+        """Розмір зведень блоків (без самих стовпців)."""
+        return sum(a.nbytes for a in self.low.values()) * 2 + self.hour_bits.nbytes
+
+    def _check(self, predicate):
+        name, op, value = predicate
+        if name not in self.columns:
+            raise ValueError(f"Невідомий стовпець: {name}. Доступні: {', '.join(self.columns)}")
+        if op not in OPERATORS:
+            raise ValueError(f"Невідомий оператор: {op}. Доступні: {', '.join(OPERATORS)}")
+        if isinstance(value, str) and (value not in self.columns or 'hour' in (name, value)):
+            raise ValueError(f"Некоректне порівняння стовпців: {name} {op} {value}")
+
+    def plan(self, predicates):
+        """Булева маска блоків, у яких можуть бути рядки, що задовольняють усі умови."""
+        candidates = np.ones(self.blocks, dtype=bool)
+        for predicate in predicates:
+            self._check(predicate)
+            name, op, value = predicate
+            if name == 'hour':
+                # години, для яких умова істинна, - бітова маска; блок підходить, якщо маски перетинаються
+                allowed = int(np.sum(1 << HOURS[OPERATORS[op](HOURS, value)]))
+                candidates &= (self.hour_bits & allowed) != 0
+            elif isinstance(value, str):
+                candidates &= _block_may_match(self.low[name], self.high[name], op,
+                                               self.low[value], self.high[value])
+            else:
+                candidates &= _block_may_match(self.low[name], self.high[name], op, value, value)
+        return candidates
+
+    def runs(self, candidates):
+        """Суцільні діапазони рядків [start, stop) для послідовних придатних блоків."""
+        blocks = np.flatnonzero(candidates)
+        if len(blocks) == 0:
+            return []
+        breaks = np.flatnonzero(np.diff(blocks) != 1) + 1
+        first = blocks[np.r_[0, breaks]]
+        last = blocks[np.r_[breaks - 1, len(blocks) - 1]]
+        return [(int(a) * self.block_rows, min((int(b) + 1) * self.block_rows, self.rows))
+                for a, b in zip(first, last)]
+
+    def select(self, predicates, prune=True):
+        """
+        Номери рядків, що задовольняють усі умови, у порядку таблиці.
+        prune=False - повне сканування тих самих стовпців (для порівняння).
+        """
+        candidates = self.plan(predicates) if prune else np.ones(self.blocks, dtype=bool)
+        parts = []
+        for start, stop in self.runs(candidates):
+            mask = None
+            for name, op, value in predicates:
+                other = self.columns[value][start:stop] if isinstance(value, str) else value
+                result = OPERATORS[op](self.columns[name][start:stop], other)
+                mask = result if mask is None else mask & result
+            parts.append(np.flatnonzero(mask) + start)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+
+def task5_zoned(data, zone_map):
+    """task5 з відкиданням блоків за зонною картою (результат як у task5_numpy / task5_pandas)."""
+    group2_rows = zone_map.select(TASK5_PREDICATES)
+    half_idx = len(group2_rows) // 2
+    rows = np.concatenate((group2_rows[:half_idx][::3], group2_rows[half_idx:][::4]))
+    return data.iloc[rows] if hasattr(data, 'iloc') else data[rows]
+
+
+def zone_map_report(data, block_rows=BLOCK_ROWS, repeats=5):
+    """Час побудови зонної карти, частка переглянутих блоків і час task5 з відкиданням і без."""
+    started = time.perf_counter()
+    zone_map = ZoneMap.build(data, block_rows)
+    build_ms = (time.perf_counter() - started) * 1000
+    candidates = zone_map.plan(TASK5_PREDICATES)
+
+    def timed(prune):
+        times = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            zone_map.select(TASK5_PREDICATES, prune)
+            times.append(time.perf_counter() - started)
+        return min(times) * 1000
+
+    full_ms, pruned_ms = timed(False), timed(True)
+    print(f"\nЗонна карта: {zone_map.blocks} блоків по {block_rows} рядків, "
+          f"{zone_map.nbytes() / 1024:.1f} КБ, побудова {build_ms:.1f} мс")
+    print(f"task5: переглянуто {np.count_nonzero(candidates)} з {zone_map.blocks} блоків "
+          f"({np.count_nonzero(candidates) / max(zone_map.blocks, 1):.1%}); "
+          f"повне сканування {full_ms:.3f} мс, з відкиданням {pruned_ms:.3f} мс")
+    return zone_map
@@ -0,0 +1,212 @@
+# Пакетна (без інтерфейсу) фільтрація великих сигналів з обмеженою пам'яттю
+# Вхід - .npy або сирий бінарний файл (відображаються в пам'ять через memmap) чи CSV
+# (спершу порціями перекладається у тимчасовий бінарний файл). Сигнал обробляється
+# порціями по chunk відліків, результат записується у вихідний файл одразу після кожної порції.
+#   - Moving Average і Hann Filter - потокові фільтри з streaming.py: між порціями
+#     переноситься хвіст вікна, тож результат збігається з moving_average_filter / hann_filter
+#     на всьому сигналі (для Ханна вихід зсувається на delay відліків, решта - з flush()).
+#   - Butterworth - нульфазовий фільтр, що збігається з sosfiltfilt: сигнал доповнюється
+#     непарним продовженням, прямий прохід sosfilt зі станом пишеться в тимчасовий memmap,
+#     потім зворотний прохід іде порціями від кінця до початку.
+#
+# Запуск:
+#   python batch_filter.py signal.npy filtered.npy --filter "Hann Filter" --window-size 25
+#   python batch_filter.py signal.f32 filtered.f32 --dtype float32 --filter Butterworth --cutoff 3 --fs 1000
+#   python batch_filter.py signal.csv filtered.csv --column 1 --skip-rows 1
+import argparse
+import itertools
+import os
+import tempfile
+import time
+
+import numpy as np
+from scipy.signal import sosfilt, sosfilt_zi
+
+from filter_engine import design_filter
+from streaming import StreamingHannFilter, StreamingMovingAverage
+
+FILTER_TYPES = ['Moving Average', 'Hann Filter', 'Butterworth']
+CHUNK = 2 ** 20
+
+
+def spool_csv(path, out_path, column=0, delimiter=',', skip_rows=0, chunk=CHUNK):
+    """Один стовпець CSV порціями у сирий файл float64; повертає кількість відліків."""
+    count = 0
+    with open(path, encoding='utf-8') as src, open(out_path, 'wb') as dst:
+        for _ in range(skip_rows):
+            next(src, None)
+        while True:
+            lines = list(itertools.islice(src, chunk))
+            if not lines:
+                break
+            values = np.loadtxt(lines, delimiter=delimiter, usecols=column, ndmin=1, dtype=np.float64)
+            dst.write(values.tobytes())
+            count += len(values)
+    return count
+
+
+def open_signal(path, dtype='float64', column=0, delimiter=',', skip_rows=0, workdir=None):
+    """
+    Сигнал як одновимірний масив, відображений у пам'ять.
+    Повертає (масив, шлях тимчасового файлу або None) - тимчасовий файл видаляє викликач.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npy':
+        signal = np.load(path, mmap_mode='r')
+        if signal.ndim != 1:
+            raise ValueError(f"Очікується одновимірний сигнал, отримано форму {signal.shape}")
+        return signal, None
+    if ext in ('.csv', '.txt'):
+        fd, spool = tempfile.mkstemp(suffix='.f64', dir=workdir)
+        os.close(fd)
+        if spool_csv(path, spool, column, delimiter, skip_rows) == 0:
+            os.remove(spool)
+            return np.zeros(0), None
+        return np.memmap(spool, dtype=np.float64, mode='r'), spool
+    return np.memmap(path, dtype=dtype, mode='r'), None
+
+
+class SignalWriter:
+    """Інкрементний запис результату: .npy (open_memmap), .csv/.txt або сирий бінарний файл."""
+
+    def __init__(self, path, length, dtype='float64'):
+        self.ext = os.path.splitext(path)[1].lower()
+        self.dtype = np.dtype(dtype)
+        self.position = 0
+        if self.ext == '.npy':
+            self._memmap = np.lib.format.open_memmap(path, mode='w+', dtype=self.dtype, shape=(length,))
+        else:
+            self._file = open(path, 'w' if self.ext in ('.csv', '.txt') else 'wb')
+
+    def write(self, chunk):
+        if self.ext == '.npy':
+            self._memmap[self.position:self.position + len(chunk)] = chunk
+        elif self.ext in ('.csv', '.txt'):
+            np.savetxt(self._file, chunk.astype(self.dtype), fmt='%.10g')
+        else:
+            self._file.write(chunk.astype(self.dtype).tobytes())
+        self.position += len(chunk)
+
+    def close(self):
+        if self.ext == '.npy':
+            self._memmap.flush()
+            del self._memmap
+        else:
+            self._file.close()
+
+
+def _chunks(signal, chunk):
+    for start in range(0, len(signal), chunk):
+        yield np.asarray(signal[start:start + chunk], dtype=np.float64)
+
+
+def filter_fir(signal, stream_filter, writer, chunk=CHUNK):
+    """Потоковий фільтр зі streaming.py по порціях; вихід вирівнюється на delay відліків."""
+    skip = stream_filter.delay
+    for block in itertools.chain(_chunks(signal, chunk), [None]):
+        filtered = stream_filter.flush() if block is None else stream_filter.process(block)
+        if skip:
+            dropped = min(skip, len(filtered))
+            filtered = filtered[dropped:]
+            skip -= dropped
+        if len(filtered):
+            writer.write(filtered)
+
+
+def default_padlen(sos):
+    """Довжина доповнення, яку sosfiltfilt використовує за замовчуванням."""
+    ntaps = 2 * len(sos) + 1
+    ntaps -= min(int((sos[:, 2] == 0).sum()), int((sos[:, 5] == 0).sum()))
+    return 3 * ntaps
+
+
+def filter_zero_phase(signal, sos, writer, chunk=CHUNK, workdir=None):
+    """
+    sosfiltfilt(sos, signal) порціями: прямий прохід у тимчасовий memmap,
+    зворотний - на місці від кінця до початку, потім запис результату по порціях.
+    """
+    n = len(signal)
+    edge = default_padlen(sos)
+    if n <= edge:
+        raise ValueError(f"Сигнал з {n} відліків закороткий для нульфазового фільтра (потрібно > {edge})")
+    x_first, x_last = float(signal[0]), float(signal[-1])
+    # непарне продовження на edge відліків з обох боків (як padtype='odd')
+    left = 2 * x_first - np.asarray(signal[edge:0:-1], dtype=np.float64)
+    right = 2 * x_last - np.asarray(signal[-2:-(edge + 2):-1], dtype=np.float64)
+
+    zi = sosfilt_zi(sos)
+    fd, temp_path = tempfile.mkstemp(suffix='.f64', dir=workdir)
+    os.close(fd)
+    try:
+        work = np.memmap(temp_path, dtype=np.float64, mode='w+', shape=(n + 2 * edge,))
+        state = zi * left[0]
+        position = 0
+        for block in itertools.chain([left], _chunks(signal, chunk), [right]):
+            work[position:position + len(block)], state = sosfilt(sos, block, zi=state)
+            position += len(block)
+
+        state = zi * work[-1]
+        for stop in range(len(work), 0, -chunk):
+            start = max(stop - chunk, 0)
+            backward, state = sosfilt(sos, work[start:stop][::-1], zi=state)
+            work[start:stop] = backward[::-1]
+
+        for start in range(edge, edge + n, chunk):
+            writer.write(np.asarray(work[start:min(start + chunk, edge + n)]))
+        del work
+    finally:
+        os.remove(temp_path)
+
+
+def run(input_path, output_path, filter_type='Moving Average', window_size=10, order=4, cutoff=3.0,
+        fs=1000, chunk=CHUNK, dtype='float64', out_dtype='float64', column=0, delimiter=',', skip_rows=0):
+    """Фільтрує файл input_path у output_path; повертає (кількість відліків, секунди)."""
+    started = time.perf_counter()
+    workdir = os.path.dirname(os.path.abspath(output_path))
+    signal, spool = open_signal(input_path, dtype, column, delimiter, skip_rows, workdir)
+    try:
+        writer = SignalWriter(output_path, len(signal), out_dtype)
+        try:
+            if filter_type == 'Moving Average':
+                filter_fir(signal, StreamingMovingAverage(window_size), writer, chunk)
+            elif filter_type == 'Hann Filter':
+                filter_fir(signal, StreamingHannFilter(window_size), writer, chunk)
+            elif filter_type == 'Butterworth':
+                filter_zero_phase(signal, design_filter(order, cutoff, fs), writer, chunk, workdir)
+            else:
+                raise ValueError(f"Невідомий тип фільтру: {filter_type}")
+        finally:
+            writer.close()
+    finally:
+        del signal
+        if spool is not None:
+            os.remove(spool)
+    return writer.position, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетна фільтрація великих сигналів порціями")
+    parser.add_argument('input', help=".npy, .csv/.txt або сирий бінарний файл (--dtype)")
+    parser.add_argument('output', help=".npy, .csv/.txt або сирий бінарний файл (--out-dtype)")
+    parser.add_argument('--filter', default='Moving Average', choices=FILTER_TYPES)
+    parser.add_argument('--window-size', type=int, default=10)
+    parser.add_argument('--order', type=int, default=4)
+    parser.add_argument('--cutoff', type=float, default=3.0)
+    parser.add_argument('--fs', type=float, default=1000)
+    parser.add_argument('--chunk', type=int, default=CHUNK, help="відліків у порції")
+    parser.add_argument('--dtype', default='float64', help="тип відліків сирого вхідного файлу")
+    parser.add_argument('--out-dtype', default='float64')
+    parser.add_argument('--column', type=int, default=0, help="стовпець CSV")
+    parser.add_argument('--delimiter', default=',')
+    parser.add_argument('--skip-rows', type=int, default=0, help="рядків заголовка CSV")
+    args = parser.parse_args()
+
+    samples, elapsed = run(args.input, args.output, args.filter, args.window_size, args.order, args.cutoff,
+                           args.fs, args.chunk, args.dtype, args.out_dtype, args.column, args.delimiter,
+                           args.skip_rows)
+    print(f"{args.filter}: {samples} відліків за {elapsed:.2f} с "
+          f"({samples / elapsed:,.0f} відліків/с, порція {args.chunk})")
+
+
+if __name__ == "__main__":
+    main()
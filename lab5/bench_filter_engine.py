@@ -0,0 +1,46 @@
+# Бенчмарк затримки одного оновлення фільтрованого сигналу для 10k-10M відліків
+# Порівняння: старий шлях (генерація сигналу ще раз + butter + filtfilt)
+# та новий (кешований SOS-проєкт + sosfiltfilt по вже обчисленому сигналу)
+import timeit
+
+import numpy as np
+from scipy.signal import butter, filtfilt
+
+from filter_engine import zero_phase_filter, cache_info
+
+sampling_frequency = 1000
+order = 4
+cutoff_frequency = 3.0
+sizes = [10_000, 100_000, 1_000_000, 10_000_000]
+
+
+def old_update(t, noise):
+    y = np.sin(2 * np.pi * t)
+    y_noisy = y + noise
+    # повторна генерація сигналу всередині filtered_harmonic_with_noise
+    y_again = np.sin(2 * np.pi * t) + noise
+    b, a = butter(order, cutoff_frequency / (0.5 * sampling_frequency), btype='low', analog=False)
+    return y_noisy, filtfilt(b, a, y_again)
+
+
+def new_update(t, noise):
+    y = np.sin(2 * np.pi * t)
+    y_noisy = y + noise
+    return y_noisy, zero_phase_filter(y_noisy, order, cutoff_frequency, sampling_frequency, 'low')
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'samples':>12} {'old, ms':>10} {'new, ms':>10} {'speedup':>8}")
+    for n in sizes:
+        t = np.arange(n) / sampling_frequency
+        noise = rng.normal(0, np.sqrt(0.1), n)
+        repeats = max(1, 200_000 // n)
+        old_ms = timeit.timeit(lambda: old_update(t, noise), number=repeats) / repeats * 1000
+        new_ms = timeit.timeit(lambda: new_update(t, noise), number=repeats) / repeats * 1000
+        print(f"{n:>12} {old_ms:>10.2f} {new_ms:>10.2f} {old_ms / new_ms:>8.2f}")
+    print(f"\nКеш проєктів фільтрів: {cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
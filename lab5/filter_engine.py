@@ -0,0 +1,57 @@
+# Рушій фільтрації Баттерворта з кешуванням коефіцієнтів
+import functools
+
+from scipy.signal import butter, sosfiltfilt
+
+# підтримувані типи фільтру
+FILTER_TYPES = ('low', 'high', 'band')
+
+
+# нормалізація частоти зрізу: скаляр для low/high, пара (низ, верх) для band
+def _normalize_cutoff(cutoff, btype):
+    if btype == 'band':
+        low, high = cutoff
+        if not 0 < low < high:
+            raise ValueError(f"Для смугового фільтру потрібно 0 < low < high, отримано {cutoff}")
+        return float(low), float(high)
+    if btype not in ('low', 'high'):
+        raise ValueError(f"Невідомий тип фільтру: {btype}. Доступні: {FILTER_TYPES}")
+    return float(cutoff)
+
+
+@functools.lru_cache(maxsize=256)
+def _design_sos(order, cutoff, fs, btype):
+    nyquist = 0.5 * fs
+    if btype == 'band':
+        wn = (cutoff[0] / nyquist, cutoff[1] / nyquist)
+    else:
+        wn = cutoff / nyquist
+    # кешований масив спільний для всіх викликів - його не можна змінювати
+    return butter(order, wn, btype=btype, analog=False, output='sos')
+
+
+def design_filter(order, cutoff, fs, btype='low'):
+    """
+    Повертає коефіцієнти фільтру Баттерворта у формі секцій другого порядку (SOS).
+    Проєкт кешується за ключем (order, cutoff, fs, btype), тому повторні
+    виклики з тими самими параметрами не перераховують butter().
+    """
+    return _design_sos(int(order), _normalize_cutoff(cutoff, btype), float(fs), btype)
+
+
+def zero_phase_filter(y, order, cutoff, fs, btype='low'):
+    """
+    Фільтрація без фазового зсуву (прямий і зворотній прохід) вже обчисленого сигналу y.
+    Форма SOS стабільніша за (b, a) на високих порядках фільтру.
+    """
+    sos = design_filter(order, cutoff, fs, btype)
+    return sosfiltfilt(sos, y)
+
+
+def cache_info():
+    """Статистика кешу проєктів фільтрів (hits, misses, currsize)."""
+    return _design_sos.cache_info()
+
+
+def clear_cache():
+    _design_sos.cache_clear()
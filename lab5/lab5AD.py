@@ -1,10 +1,12 @@
 # завдання 1
-import os
+import sys
+import time
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider, Button, CheckButtons
 # завдання 2
-from scipy.signal import butter, filtfilt
+from filter_engine import zero_phase_filter
+from noise_bank import NoiseBank
 
 # Визначення всіх змінних
 # Початкові значення кожного параметру
@@ -25,10 +27,11 @@ current_color = 'red'
 # Параметри фільтру
 order = 4
 init_cutoff_frequency = 3.0
+filter_type = 'low'
 
-noise_global = None
-noise_global_mean = None
-noise_global_covariance = None
+# Банк шуму: базовий N(0, 1) генерується один раз, seed робить шум відтворюваним
+noise_seed = 42
+noise_bank = NoiseBank(noise_seed)
 
 
 # Функція генерації гармоніки
@@ -38,39 +41,30 @@ def generate_harmonic(amplitude, frequency, phase, t):
 
 # Функція генерації шуму
 def generate_noise(noise_mean, noise_covariance, t):
-    noise = np.random.normal(noise_mean, np.sqrt(noise_covariance), len(t))
+    noise = noise_bank.noise(noise_mean, noise_covariance, len(t)).copy()
     return noise
 
 
 # Функція для гармоніки з шумом
 def harmonic_with_noise(amplitude, frequency, phase, noise_mean, noise_covariance, show_noise, noise=None):
-    global noise_global
-    global noise_global_mean
-    global noise_global_covariance
     y = generate_harmonic(amplitude, frequency, phase, t)
     if noise is not None:
         return y + noise
+    if show_noise:
+        # зміна середнього/дисперсії - лише перетворення базового шуму, без нових випадкових чисел
+        return y + noise_bank.noise(noise_mean, noise_covariance, len(t))
     else:
-        if noise_global is None or len(noise_global) != len(
-                t) or noise_mean != noise_global_mean or noise_covariance != noise_global_covariance:
-            noise_global = generate_noise(noise_mean, noise_covariance, t)
-            noise_global_mean = noise_mean
-            noise_global_covariance = noise_covariance
-        if show_noise:
-            return y + noise_global
-        else:
-            return y
+        return y
 
 
 # Функція для відфільтрованої гармоніки
+# y - вже обчислений зашумлений сигнал; якщо не переданий, генерується заново
 def filtered_harmonic_with_noise(cutoff_frequency, amplitude, frequency, phase, noise_mean, noise_covariance,
-                                 show_noise):
-    y = harmonic_with_noise(amplitude, frequency, phase, noise_mean, noise_covariance, show_noise)
-    # Фільтрація сигналу
-    nyquist = 0.5 * sampling_frequency
-    normal_cutoff = cutoff_frequency / nyquist
-    b, a = butter(order, normal_cutoff, btype='low', analog=False)
-    y_filtered = filtfilt(b, a, y)
+                                 show_noise, y=None):
+    if y is None:
+        y = harmonic_with_noise(amplitude, frequency, phase, noise_mean, noise_covariance, show_noise)
+    # Фільтрація сигналу (проєкт фільтру кешується у filter_engine)
+    y_filtered = zero_phase_filter(y, order, cutoff_frequency, sampling_frequency, filter_type)
     return y_filtered
 
 
@@ -99,6 +93,100 @@ slider_noise_covariance = Slider(ax_noise_covariance, 'Noise Covariance', 0.0, 1
                                  color=current_color)
 slider_cutoff_frequency = Slider(ax_cutoff_frequency, 'Cutoff Frequency', 0.1, 10.0, valinit=init_cutoff_frequency,
                                  color=current_color)
+sliders = [slider_amplitude, slider_frequency, slider_phase, slider_noise_mean, slider_noise_covariance,
+           slider_cutoff_frequency]
+
+
+# рухомі частини слайдера в порядку малювання: заповнення, позначка valinit і ручка
+# (лінії осі слайдера в порядку додавання), значення праворуч
+def slider_artists(slider):
+    return [slider.poly, *slider.ax.lines, slider.valtext]
+
+
+# Бліттинг: статичний фон (осі, сітка, доріжки слайдерів) зберігається після
+# кожного повного малювання, а при зміні параметрів поверх нього малюються лише
+# анімовані артисти - три лінії сигналів, легенда над ними і рухомі частини слайдерів.
+# Бекенди без бліттингу (supports_blit = False) перемальовують усю фігуру через draw_idle()
+for slider in sliders:
+    # слайдер не перемальовує всю фігуру сам - це робить redraw()
+    slider.drawon = False
+
+use_blit = False
+use_decimation = True
+background = None
+# повні (не проріджені) сигнали ліній: {лінія: y}
+full_signals = {}
+
+
+def animated_artists():
+    artists = [line_harmonic, line, line_filtered, legend]
+    for slider in sliders:
+        artists += slider_artists(slider)
+    return artists
+
+
+# Проріджування min-max до buckets інтервалів (ширина осі в пікселях): у кожному
+# інтервалі залишаються мінімум і максимум у порядку появи, тож на екрані лінія
+# виглядає так само, а точок не більше 2 * buckets
+def decimate(x, y, buckets):
+    n = len(y)
+    if not use_decimation or buckets <= 0 or n <= 2 * buckets:
+        return x, y
+    size = -(-n // buckets)
+    blocks = np.concatenate((y, np.full(buckets * size - n, y[-1]))).reshape(buckets, size)
+    base = np.arange(buckets) * size
+    i_min = base + blocks.argmin(axis=1)
+    i_max = base + blocks.argmax(axis=1)
+    idx = np.column_stack((np.minimum(i_min, i_max), np.maximum(i_min, i_max))).ravel()
+    idx = np.minimum(idx, n - 1)
+    return x[idx], y[idx]
+
+
+# запам'ятовує повний сигнал лінії і показує його, проріджений до ширини осі
+def set_signal(target, y):
+    full_signals[target] = y
+    target.set_data(*decimate(t, y, int(ax.bbox.width)))
+
+
+# вмикає або вимикає бліттинг: без нього всі артисти звичайні і малюються в draw_idle()
+def set_blitting(enabled):
+    global use_blit, background
+    use_blit = enabled and fig.canvas.supports_blit
+    background = None
+    for artist in animated_artists():
+        artist.set_animated(use_blit)
+
+
+# перемальовування лише анімованих артистів поверх збереженого фону
+def redraw():
+    if not use_blit or background is None:
+        fig.canvas.draw_idle()
+        return
+    fig.canvas.restore_region(background)
+    for artist in animated_artists():
+        fig.draw_artist(artist)
+    fig.canvas.blit(fig.bbox)
+
+
+# після повного малювання (старт, зміна розміру, кнопки) зберігається новий фон
+def on_draw(event):
+    global background
+    if not use_blit:
+        return
+    background = fig.canvas.copy_from_bbox(fig.bbox)
+    for artist in animated_artists():
+        fig.draw_artist(artist)
+    fig.canvas.blit(fig.bbox)
+
+
+# після зміни розміру вікна ширина осі інша - сигнали проріджуються заново
+def on_resize(event):
+    for target, y in full_signals.items():
+        target.set_data(*decimate(t, y, int(ax.bbox.width)))
+
+
+fig.canvas.mpl_connect('draw_event', on_draw)
+fig.canvas.mpl_connect('resize_event', on_resize)
 
 
 # оновлення даних
@@ -112,26 +200,22 @@ def update(val):
 
     # Початковий графік гармоніки
     y_harmonic = generate_harmonic(amplitude, frequency, phase, t)
-    line_harmonic.set_ydata(y_harmonic)
+    set_signal(line_harmonic, y_harmonic)
 
     # Гармоніки гармоніки з накладеним шумом
     y = harmonic_with_noise(amplitude, frequency, phase, noise_mean, noise_covariance, show_noise)
-    line.set_ydata(y)
+    set_signal(line, y)
 
     # Фільтрація та оновлення відфільтрованої гармоніки
     y_filtered = filtered_harmonic_with_noise(cutoff_frequency, amplitude, frequency, phase, noise_mean,
-                                              noise_covariance, show_noise)
-    line_filtered.set_ydata(y_filtered)
+                                              noise_covariance, show_noise, y=y)
+    set_signal(line_filtered, y_filtered)
 
-    fig.canvas.draw_idle()
+    redraw()
 
 
-slider_amplitude.on_changed(update)
-slider_frequency.on_changed(update)
-slider_phase.on_changed(update)
-slider_noise_mean.on_changed(update)
-slider_noise_covariance.on_changed(update)
-slider_cutoff_frequency.on_changed(update)
+for slider in sliders:
+    slider.on_changed(update)
 
 
 # функція для чекбоксу
@@ -170,9 +254,12 @@ def change_color(event):
     line_harmonic.set_color(colors[(next_index + 1) % len(colors)])  # Кольори для гармоніки змінюються в іншому порядку
     line_filtered.set_color(
         colors[(next_index + 2) % len(colors)])  # Кольори для відфільтрованого сигналу змінюються в іншому порядку
-    ax.legend().get_texts()[0].set_color(colors[next_index])  # Зміна кольору тексту в легенді
+    legend.get_texts()[0].set_color(colors[next_index])  # Зміна кольору тексту в легенді
+    # зразки в легенді - копії ліній, тому їхні кольори оновлюються окремо
+    for handle, artist in zip(legend.legend_handles, (line_harmonic, line, line_filtered)):
+        handle.set_color(artist.get_color())
 
-    fig.canvas.draw_idle()
+    redraw()
 
 
 # інтерактивний елемент для зміни кольору
@@ -182,12 +269,8 @@ button_color.on_clicked(change_color)
 
 # функція для скидання параметрів
 def reset_parameters(event):
-    slider_amplitude.reset()
-    slider_frequency.reset()
-    slider_phase.reset()
-    slider_noise_mean.reset()
-    slider_noise_covariance.reset()
-    slider_cutoff_frequency.reset()
+    for slider in sliders:
+        slider.reset()
     update(None)
 
 
@@ -208,11 +291,43 @@ line, = ax.plot(t, y_with_noise, lw=2, color=current_color, label='Original Sign
 
 # Відфільтрований графік
 y_filtered = filtered_harmonic_with_noise(init_cutoff_frequency, init_amplitude, init_frequency, init_phase,
-                                          init_noise_mean, init_noise_covariance, show_noise)
+                                          init_noise_mean, init_noise_covariance, show_noise, y=y_with_noise)
 line_filtered, = ax.plot(t, y_filtered, lw=2, color='blue', alpha=0.5, label='Filtered Signal')
+set_signal(line_harmonic, y)
+set_signal(line, y_with_noise)
+set_signal(line_filtered, y_filtered)
+
+# Легенда (дескриптор зберігається, щоб change_color не створював легенду заново)
+legend = ax.legend()
+set_blitting(True)
+
+
+# Вимірювання часу кадру при русі слайдера: повне перемальовування фігури,
+# бліттинг без проріджування і бліттинг з проріджуванням до ширини осі.
+# Запуск без вікна: MPLBACKEND=Agg python lab5AD.py --benchmark
+def measure_frame_times(frames=50):
+    global use_decimation
+    if not fig.canvas.supports_blit:
+        print("Бекенд не підтримує бліттинг: у всіх режимах фігура перемальовується повністю")
+    values = np.linspace(0.5, 5.0, frames)
+    modes = [('повне перемальовування', False, False), ('бліттинг', True, False),
+             ('бліттинг + проріджування', True, True)]
+    for name, blit, use_decimation in modes:
+        set_blitting(blit)
+        update(None)
+        fig.canvas.draw()
+        started = time.perf_counter()
+        for value in values:
+            slider_amplitude.set_val(value)
+        frame_ms = (time.perf_counter() - started) / frames * 1000
+        points = len(line.get_xdata())
+        print(f"{name:<26} {frame_ms:8.2f} мс/кадр, точок на лінію: {points}")
+    use_decimation = True
+    set_blitting(True)
 
-# Легенда
-ax.legend()
 
 # Побудова
-plt.show()
\ No newline at end of file
+if '--benchmark' in sys.argv:
+    measure_frame_times()
+else:
+    plt.show()
\ No newline at end of file
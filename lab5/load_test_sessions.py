@@ -0,0 +1,147 @@
+# Навантажувальний тест Bokeh-сервера з багатьма реальними сесіями
+# У процесі запускається Server із застосунком laboo (make_application) у власному циклі подій,
+# а кожна імітована сесія - окремий клієнт bokeh.client.pull_session у своєму потоці:
+# клієнт періодично "рухає повзунок" Amplitude і чекає, доки сервер надішле нові дані
+# всіх трьох ліній. Затримка - від зміни повзунка до отримання оновлених даних,
+# тобто через веб-сокет, update_data, SignalSession.submit і add_next_tick_callback.
+# Одна "важка" сесія (шлях /heavy) працює з довгим сигналом - перевіряємо, чи гальмує вона інших.
+#
+# Запуск: python load_test_sessions.py --sessions 16 --updates 10 --workers 4
+import argparse
+import asyncio
+import threading
+import time
+
+import numpy as np
+from bokeh.client import pull_session
+from bokeh.models import ColumnDataSource, Slider
+from bokeh.server.server import Server
+
+from laboo import make_application, make_executor
+
+MODES = ['inline', 'threads', 'processes']
+UPDATE_TIMEOUT = 60.0
+
+
+def start_server(applications, port):
+    """Запускає Bokeh Server у фоновому потоці з власним циклом подій; повертає (server, потік)."""
+    started = threading.Event()
+    holder = {}
+
+    def run():
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        server = Server(applications, port=port, allow_websocket_origin=[f'localhost:{port}'])
+        server.start()
+        holder['server'] = server
+        started.set()
+        server.io_loop.start()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+    return holder['server'], thread
+
+
+def stop_server(server, thread):
+    def shutdown():
+        server.stop()
+        server.io_loop.stop()
+
+    server.io_loop.add_callback(shutdown)
+    thread.join(timeout=10)
+
+
+def run_session(url, updates, interval, seed, start, latencies, errors):
+    """Одна клієнтська сесія: updates змін повзунка з кроком interval секунд."""
+    rng = np.random.default_rng(seed)
+    session = pull_session(url=url)
+    try:
+        slider = session.document.select_one({'type': Slider, 'title': 'Amplitude'})
+        sources = list(session.document.select({'type': ColumnDataSource}))
+        for i in range(updates):
+            scheduled = start + i * interval
+            time.sleep(max(0.0, scheduled - time.perf_counter()))
+            old = [source.data['y'] for source in sources]
+            value = round(float(rng.uniform(0.1, 10.0)), 1)
+            slider.value = value if value != slider.value else round(value + 0.1, 1)
+            # сервер замінює дані всіх ліній - чекаємо, доки нові масиви надійдуть у документ клієнта.
+            # force_roundtrip тут не підходить: в очікуванні відповіді клієнт відкидає PATCH-DOC,
+            # тому крутимо звичайний цикл повідомлень з'єднання, який застосовує патчі до документа
+            deadline = time.perf_counter() + UPDATE_TIMEOUT
+
+            def updated():
+                return (all(source.data['y'] is not y for source, y in zip(sources, old))
+                        or time.perf_counter() > deadline)
+
+            session._connection._loop_until(updated)
+            if time.perf_counter() > deadline:
+                errors.append(f"{url}: немає оновлення за {UPDATE_TIMEOUT:.0f} с")
+                return
+            latencies.append(time.perf_counter() - scheduled)
+    finally:
+        session.close()
+
+
+def run_load(port, sessions, updates, interval, heavy):
+    light, heavy_latencies, errors = [], [], []
+    # сесії стартують після під'єднання всіх клієнтів - спільний момент початку
+    start = time.perf_counter() + 1.0 + 0.05 * sessions
+    threads = []
+    for i in range(sessions):
+        is_heavy = i == 0 and heavy
+        url = f"http://localhost:{port}/{'heavy' if is_heavy else ''}"
+        threads.append(threading.Thread(target=run_session, args=(url, updates, interval, i, start,
+                                                                  heavy_latencies if is_heavy else light, errors)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return light, heavy_latencies, errors
+
+
+def report(mode, light, heavy, errors, elapsed):
+    line = f"{mode:>10}: {len(light) + len(heavy):>5} оновлень за {elapsed:6.2f} с"
+    if light:
+        light_ms = np.array(light) * 1000
+        line += f", легкі сесії p50={np.percentile(light_ms, 50):8.1f} мс p95={np.percentile(light_ms, 95):8.1f} мс"
+    if heavy:
+        line += f", важка p50={np.percentile(np.array(heavy) * 1000, 50):8.1f} мс"
+    if errors:
+        line += f", помилок: {len(errors)} ({errors[0]})"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Навантажувальний тест сесій Bokeh-сервера")
+    parser.add_argument('--sessions', type=int, default=16)
+    parser.add_argument('--updates', type=int, default=5)
+    parser.add_argument('--interval', type=float, default=0.2, help="пауза між оновленнями сесії, с")
+    parser.add_argument('--heavy-samples', type=int, default=200000, help="0 - без важкої сесії")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--port', type=int, default=5011)
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        executor = None
+        if mode == 'threads':
+            executor = make_executor(threads=args.workers)
+        elif mode == 'processes':
+            executor = make_executor(workers=args.workers)
+        applications = {'/': make_application(executor)}
+        if args.heavy_samples:
+            applications['/heavy'] = make_application(executor, samples=args.heavy_samples)
+        server, thread = start_server(applications, args.port)
+        try:
+            started = time.perf_counter()
+            light, heavy, errors = run_load(args.port, args.sessions, args.updates, args.interval,
+                                            args.heavy_samples > 0)
+            report(mode, light, heavy, errors, time.perf_counter() - started)
+        finally:
+            stop_server(server, thread)
+            if executor is not None:
+                executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
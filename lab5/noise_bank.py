@@ -0,0 +1,82 @@
+# Банк відтворюваного шуму для лабораторної 5
+# Для кожної довжини сигналу один раз генерується стандартний нормальний шум z
+# (генератор з seed [seed, довжина], тож вектор не залежить від порядку запитів),
+# а будь-який варіант з середнім mean і дисперсією cov отримується як mean + sqrt(cov) * z
+import threading
+import weakref
+
+import numpy as np
+
+
+class NoiseBank:
+    """
+    Потокобезпечне сховище базового шуму N(0, 1) для заданого seed.
+    Зміна середнього чи дисперсії не потребує нових випадкових чисел -
+    лише перетворення базового вектора.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._base = {}
+        self._last = {}
+
+    def base(self, length):
+        """Базовий стандартний нормальний шум довжини length (генерується один раз)."""
+        with self._lock:
+            return self._get_base(length)
+
+    def _get_base(self, length):
+        z = self._base.get(length)
+        if z is None:
+            # однаковий (seed, length) завжди дає той самий вектор, також після clear()
+            rng = np.random.default_rng(None if self.seed is None else [self.seed, length])
+            z = rng.standard_normal(length)
+            z.setflags(write=False)
+            self._base[length] = z
+        return z
+
+    def noise(self, noise_mean, noise_covariance, length, out=None):
+        """
+        Повертає шум N(noise_mean, noise_covariance) довжини length.
+        Без out повертається новий масив лише для читання; він запам'ятовується і
+        повторно повертається для тих самих параметрів, але ніколи не змінюється на місці,
+        тож інший потік з іншими параметрами не перезапише дані, які ще читає викликач.
+        """
+        with self._lock:
+            z = self._get_base(length)
+            if out is not None:
+                np.multiply(z, np.sqrt(noise_covariance), out=out)
+                out += noise_mean
+                return out
+
+            params = (noise_mean, noise_covariance)
+            last = self._last.get(length)
+            if last is not None and last[0] == params:
+                return last[1]
+        noise = z * np.sqrt(noise_covariance)
+        noise += noise_mean
+        noise.setflags(write=False)
+        with self._lock:
+            self._last[length] = (params, noise)
+        return noise
+
+    def clear(self):
+        with self._lock:
+            self._base.clear()
+            self._last.clear()
+
+
+# окремий банк шуму для кожного документа (сесії) Bokeh
+_session_banks = weakref.WeakKeyDictionary()
+_session_lock = threading.Lock()
+
+
+def session_noise_bank(doc, seed=None):
+    """Повертає банк шуму, прив'язаний до документа doc; різні сесії не ділять шум."""
+    with _session_lock:
+        bank = _session_banks.get(doc)
+        if bank is None:
+            bank = NoiseBank(seed)
+            _session_banks[doc] = bank
+        return bank
@@ -0,0 +1,122 @@
+# Обчислювальне ядро сигналів для Bokeh-застосунку (без залежності від Bokeh)
+# Тут лише детерміновані функції: їх можна викликати з будь-якої сесії,
+# потоку чи процесу пулу обробників
+import functools
+import threading
+
+import numpy as np
+
+from noise_bank import NoiseBank
+
+# параметри сигналу за замовчуванням
+init_amplitude = 1.0
+init_frequency = 1.0
+init_phase = 0.0
+init_noise_mean = 0.0
+init_noise_covariance = 0.1
+init_filter_window_size = 10
+init_samples = 10000
+init_seed = 42
+filter_types = ['Moving Average', 'Hann Filter']
+
+
+# спільний кеш тільки для читання: часова сітка однакова для всіх сесій
+@functools.lru_cache(maxsize=16)
+def time_grid(samples=init_samples):
+    t = np.linspace(0, 10, samples)
+    t.setflags(write=False)
+    return t
+
+
+@functools.lru_cache(maxsize=128)
+def cached_harmonic(amplitude, frequency, phase, samples=init_samples):
+    y = generate_harmonic(amplitude, frequency, phase, time_grid(samples))
+    y.setflags(write=False)
+    return y
+
+
+# генерація гармонічного сигналу
+def generate_harmonic(amplitude, frequency, phase, t):
+    return amplitude * np.sin(2 * np.pi * frequency * t + phase)
+
+
+# Moving average filter function - ковзаюче середнє
+def moving_average_filter(signal, window_size):
+    filtered_signal = np.zeros_like(signal)
+    for i in range(len(signal)):
+        if i < window_size:
+            filtered_signal[i] = np.mean(signal[:i+1])
+        else:
+            filtered_signal[i] = np.mean(signal[i-window_size+1:i+1])
+    return filtered_signal
+
+
+# Hann filter function
+# signal - це вхідний сигнал, до якого застосовується фільтр.
+# window_size - розмір вікна фільтра.
+def hann_filter(signal, window_size):
+    hann = np.hanning(window_size) # створює вікно Ханна
+    hann = hann / sum(hann)  # Normalization
+
+    # згладити вхідний сигнал signal за допомогою вікна Ханна.
+    filtered_signal = np.convolve(signal, hann, mode='same')
+    # Параметр mode='same' означає, що вихідний сигнал буде такого ж розміру, як і вхідний.
+    return filtered_signal
+
+
+# функція вибору типу фільтру: або ковзаюче середнє або фільтр Ханна
+def apply_filter(filter_type, signal, window_size):
+    if filter_type == 'Moving Average':
+        return moving_average_filter(signal, window_size)
+    elif filter_type == 'Hann Filter':
+        return hann_filter(signal, window_size)
+    raise ValueError(f"Невідомий тип фільтру: {filter_type}")
+
+
+# банки шуму процесів-обробників: однаковий seed дає однаковий шум у будь-якому процесі
+_worker_banks = {}
+_worker_lock = threading.Lock()
+
+
+def _bank_for_seed(seed):
+    with _worker_lock:
+        bank = _worker_banks.get(seed)
+        if bank is None:
+            bank = NoiseBank(seed)
+            _worker_banks[seed] = bank
+        return bank
+
+
+def default_params():
+    return {
+        'amplitude': init_amplitude,
+        'frequency': init_frequency,
+        'phase': init_phase,
+        'noise_mean': init_noise_mean,
+        'noise_covariance': init_noise_covariance,
+        'filter_type': filter_types[0],
+        'filter_window_size': init_filter_window_size,
+        'show_noise': True,
+        'samples': init_samples,
+        'seed': init_seed,
+    }
+
+
+def compute_signals(params, noise_bank=None):
+    """
+    Обчислює всі три сигнали для набору параметрів params (див. default_params).
+    Без noise_bank використовується банк процесу для params['seed'], тому функцію
+    можна виконувати в пулі процесів і отримати той самий шум, що й у сесії.
+    """
+    samples = params['samples']
+    if noise_bank is None:
+        noise_bank = _bank_for_seed(params['seed'])
+
+    t = time_grid(samples)
+    harmonic = cached_harmonic(params['amplitude'], params['frequency'], params['phase'], samples)
+    if params['show_noise']:
+        noisy = harmonic + noise_bank.noise(params['noise_mean'], params['noise_covariance'], samples)
+    else:
+        noisy = harmonic.copy()
+    filtered = apply_filter(params['filter_type'], noisy, params['filter_window_size'])
+    return {'t': t, 'harmonic': harmonic, 'noisy': noisy, 'filtered': filtered}
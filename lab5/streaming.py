@@ -0,0 +1,192 @@
+# Потоковий режим для фільтрів лабораторної 5
+# Кільцевий буфер фіксованого розміру та фільтри зі станом між порціями (chunks):
+# пам'ять і вартість обробки порції не залежать від тривалості потоку
+import numpy as np
+from scipy.signal import sosfilt, sosfilt_zi
+
+from filter_engine import design_filter
+
+
+class RingBuffer:
+    """Кільцевий буфер останніх capacity відліків на основі NumPy-масиву."""
+
+    def __init__(self, capacity, dtype=float):
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=dtype)
+        self._end = 0
+        self.size = 0
+        self.total = 0
+
+    def append(self, chunk):
+        chunk = np.asarray(chunk)
+        n = len(chunk)
+        self.total += n
+        if n >= self.capacity:
+            # у буфер вміщується лише хвіст порції
+            self._data[:] = chunk[-self.capacity:]
+            self._end = 0
+            self.size = self.capacity
+            return
+        first = min(n, self.capacity - self._end)
+        self._data[self._end:self._end + first] = chunk[:first]
+        self._data[:n - first] = chunk[first:]
+        self._end = (self._end + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def values(self):
+        """Вміст буфера в хронологічному порядку (копія)."""
+        if self.size < self.capacity:
+            return self._data[:self.size].copy()
+        return np.concatenate((self._data[self._end:], self._data[:self._end]))
+
+    def clear(self):
+        self._end = 0
+        self.size = 0
+        self.total = 0
+
+
+class StreamingMovingAverage:
+    """
+    Ковзаюче середнє по порціях. Результат збігається з moving_average_filter
+    на всьому сигналі: між порціями зберігається хвіст з window_size - 1 відліків.
+    """
+
+    delay = 0
+
+    def __init__(self, window_size):
+        self.window_size = int(window_size)
+        self.reset()
+
+    def reset(self):
+        self._tail = np.zeros(0)
+        self._seen = 0
+
+    def process(self, chunk):
+        chunk = np.asarray(chunk, dtype=float)
+        ext = np.concatenate((self._tail, chunk))
+        csum = np.concatenate(([0.0], np.cumsum(ext)))
+        # на початку потоку вікно коротше: середнє по всіх наявних відліках
+        counts = np.minimum(np.arange(self._seen + 1, self._seen + len(chunk) + 1), self.window_size)
+        ends = np.arange(len(self._tail) + 1, len(ext) + 1)
+        filtered = (csum[ends] - csum[ends - counts]) / counts
+
+        self._seen += len(chunk)
+        self._tail = ext[-(self.window_size - 1):] if self.window_size > 1 else np.zeros(0)
+        return filtered
+
+    def flush(self):
+        return np.zeros(0)
+
+
+class StreamingHannFilter:
+    """
+    Згортка з нормованим вікном Ханна по порціях (хвіст згортки переноситься між ними).
+    Фільтр причинний: вихід відстає від hann_filter(mode='same') на delay відліків,
+    решта виходу повертається з flush() наприкінці потоку.
+    """
+
+    def __init__(self, window_size):
+        self.window_size = int(window_size)
+        hann = np.hanning(self.window_size)
+        self.kernel = hann / sum(hann)
+        self.delay = (self.window_size - 1) // 2
+        self.reset()
+
+    def reset(self):
+        self._tail = np.zeros(self.window_size - 1)
+
+    def process(self, chunk):
+        chunk = np.asarray(chunk, dtype=float)
+        if len(chunk) == 0:
+            # для вікна 1 хвіст порожній, і np.convolve не приймає порожній масив
+            return np.zeros(0)
+        ext = np.concatenate((self._tail, chunk))
+        filtered = np.convolve(ext, self.kernel, mode='valid')
+        self._tail = ext[len(ext) - (self.window_size - 1):]
+        return filtered
+
+    def flush(self):
+        return self.process(np.zeros(self.delay))
+
+
+class StreamingButterworth:
+    """
+    Фільтр Баттерворта по порціях (sosfilt зі станом zi між порціями).
+    На потоці можливий лише причинний (не нульфазовий) варіант фільтра.
+    """
+
+    delay = 0
+
+    def __init__(self, order, cutoff, fs, btype='low'):
+        self.sos = design_filter(order, cutoff, fs, btype)
+        self.reset()
+
+    def reset(self):
+        self._zi = None
+
+    def process(self, chunk):
+        chunk = np.asarray(chunk, dtype=float)
+        if len(chunk) == 0:
+            return chunk
+        if self._zi is None:
+            # стаціонарний початковий стан для першого відліку - без перехідного стрибка
+            self._zi = sosfilt_zi(self.sos) * chunk[0]
+        filtered, self._zi = sosfilt(self.sos, chunk, zi=self._zi)
+        return filtered
+
+    def flush(self):
+        return np.zeros(0)
+
+
+def make_stream_filter(filter_type, window_size=10, cutoff=3.0, fs=1000, order=4):
+    if filter_type == 'Moving Average':
+        return StreamingMovingAverage(window_size)
+    elif filter_type == 'Hann Filter':
+        return StreamingHannFilter(window_size)
+    elif filter_type == 'Butterworth':
+        return StreamingButterworth(order, cutoff, fs)
+    raise ValueError(f"Невідомий тип фільтру: {filter_type}")
+
+
+class StreamPipeline:
+    """
+    Потік відліків: кільцевий буфер сирого сигналу + фільтр зі станом.
+    process() повертає час, сирі та відфільтровані значення для нової порції;
+    при зміні фільтра його стан відновлюється прогоном вмісту буфера.
+    """
+
+    def __init__(self, stream_filter, fs=1000, capacity=10000):
+        self.fs = fs
+        self.buffer = RingBuffer(capacity)
+        self.filter = stream_filter
+
+    def process(self, chunk):
+        chunk = np.asarray(chunk, dtype=float)
+        start = self.buffer.total
+        self.buffer.append(chunk)
+        t = np.arange(start, start + len(chunk)) / self.fs
+        filtered = self.filter.process(chunk)
+        # відфільтрований відлік i відповідає моменту i - delay
+        t_filtered = t - self.filter.delay / self.fs
+        return t, chunk, t_filtered, filtered
+
+    def set_filter(self, stream_filter):
+        """Замінює фільтр і прогріває його на вмісті буфера; повертає перераховане вікно."""
+        self.filter = stream_filter
+        raw = self.buffer.values()
+        start = self.buffer.total - len(raw)
+        t = np.arange(start, start + len(raw)) / self.fs
+        filtered = self.filter.process(raw)
+        return t, raw, t - self.filter.delay / self.fs, filtered
+
+
+def harmonic_sensor(amplitude=1.0, frequency=1.0, phase=0.0, noise_mean=0.0, noise_covariance=0.1,
+                    fs=1000, chunk_size=100, seed=None):
+    """Імітація датчика: нескінченний потік порцій гармоніки з шумом."""
+    rng = np.random.default_rng(seed)
+    start = 0
+    while True:
+        t = np.arange(start, start + chunk_size) / fs
+        noise = noise_mean + np.sqrt(noise_covariance) * rng.standard_normal(chunk_size)
+        yield amplitude * np.sin(2 * np.pi * frequency * t + phase) + noise
+        start += chunk_size
@@ -0,0 +1,174 @@
+# Векторизований перебір параметрів гармоніки та фільтрів
+# Масиви параметрів розгортаються в блок (параметри x відліки), усі рядки
+# фільтруються одним векторизованим викликом, а для кожного рядка рахуються
+# похибки відносно чистої гармоніки.
+#
+# Запуск демонстрації: python sweep.py --workers 4
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.signal import fftconvolve, sosfiltfilt
+
+from filter_engine import design_filter
+from noise_bank import NoiseBank
+from signal_core import generate_harmonic, time_grid, init_samples, init_seed
+
+FILTER_TYPES = ['Moving Average', 'Hann Filter', 'Butterworth']
+
+
+def param_grid(**axes):
+    """Декартів добуток осей параметрів: param_grid(amplitude=[1, 2], window_size=[5, 10]) -> 4 рядки."""
+    names = list(axes)
+    mesh = np.meshgrid(*(np.atleast_1d(axes[name]) for name in names), indexing='ij')
+    return {name: values.ravel() for name, values in zip(names, mesh)}
+
+
+def harmonic_batch(amplitude, frequency, phase, t, rows=None):
+    """
+    Блок гармонік (rows x відліки): параметри - масиви довжини rows або скаляри.
+    Без rows кількість рядків визначається за параметрами (скаляри - один рядок).
+    """
+    if rows is None:
+        rows = np.broadcast(amplitude, frequency, phase).size
+    amplitude, frequency, phase = (np.broadcast_to(np.asarray(p, dtype=float), (rows,))
+                                   for p in (amplitude, frequency, phase))
+    return generate_harmonic(amplitude[:, None], frequency[:, None], phase[:, None], t[None, :])
+
+
+def moving_average_batch(Y, window_size):
+    """
+    Ковзаюче середнє для кожного рядка Y; window_size - скаляр або масив по рядках.
+    Збігається з moving_average_filter: на початку рядка вікно коротше.
+    """
+    rows, n = Y.shape
+    windows = np.broadcast_to(np.asarray(window_size, dtype=np.int64), (rows,))
+    csum = np.zeros((rows, n + 1))
+    np.cumsum(Y, axis=1, out=csum[:, 1:])
+    ends = np.arange(1, n + 1)
+    counts = np.minimum(ends[None, :], windows[:, None])
+    starts = ends[None, :] - counts
+    return (csum[:, 1:] - np.take_along_axis(csum, starts, axis=1)) / counts
+
+
+def hann_batch(Y, window_size):
+    """Згортка кожного рядка Y з нормованим вікном Ханна (mode='same'), групами за розміром вікна."""
+    windows = np.broadcast_to(np.asarray(window_size, dtype=np.int64), (len(Y),))
+    filtered = np.empty_like(Y)
+    for w in np.unique(windows):
+        rows = windows == w
+        hann = np.hanning(w)
+        hann = hann / sum(hann)
+        filtered[rows] = fftconvolve(Y[rows], hann[None, :], mode='same', axes=1)
+    return filtered
+
+
+def butterworth_batch(Y, cutoff, fs, order=4, btype='low'):
+    """
+    Нульфазова фільтрація рядків Y; cutoff і order - скаляри або масиви по рядках.
+    Рядки з однаковою парою (порядок, частота зрізу) - одним викликом sosfiltfilt.
+    """
+    cutoffs = np.broadcast_to(np.asarray(cutoff, dtype=float), (len(Y),))
+    orders = np.broadcast_to(np.asarray(order, dtype=np.int64), (len(Y),))
+    filtered = np.empty_like(Y)
+    for o, c in {(int(o), float(c)) for o, c in zip(orders, cutoffs)}:
+        rows = (orders == o) & (cutoffs == c)
+        filtered[rows] = sosfiltfilt(design_filter(o, c, fs, btype), Y[rows], axis=-1)
+    return filtered
+
+
+def _filter_param(params, name, filter_type):
+    if name not in params:
+        raise ValueError(f"Для фільтру {filter_type} потрібен параметр {name}")
+    return params[name]
+
+
+def filter_batch(filter_type, Y, params, fs):
+    if filter_type == 'Moving Average':
+        return moving_average_batch(Y, _filter_param(params, 'window_size', filter_type))
+    elif filter_type == 'Hann Filter':
+        return hann_batch(Y, _filter_param(params, 'window_size', filter_type))
+    elif filter_type == 'Butterworth':
+        return butterworth_batch(Y, _filter_param(params, 'cutoff', filter_type), fs, params.get('order', 4))
+    raise ValueError(f"Невідомий тип фільтру: {filter_type}. Доступні: {FILTER_TYPES}")
+
+
+def error_metrics(clean, noisy, filtered):
+    """MSE зашумленого і відфільтрованого сигналів відносно чистого та покращення SNR у дБ."""
+    mse_noisy = np.mean((noisy - clean) ** 2, axis=1)
+    mse_filtered = np.mean((filtered - clean) ** 2, axis=1)
+    power = np.mean(clean ** 2, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'mse_noisy': mse_noisy,
+            'mse_filtered': mse_filtered,
+            'snr_filtered_db': 10 * np.log10(power / mse_filtered),
+            'snr_improvement_db': 10 * np.log10(mse_noisy / mse_filtered),
+        }
+
+
+def sweep(params, filter_type='Moving Average', samples=init_samples, noise_mean=0.0, noise_covariance=0.1,
+          seed=init_seed, fs=1000):
+    """
+    Оцінює всі комбінації params (словник масивів однакової довжини: amplitude, frequency,
+    phase, window_size або cutoff та order) одним блоком. Шум однаковий для всіх рядків.
+    Повертає словник метрик по рядках.
+    """
+    t = time_grid(samples)
+    rows = len(next(iter(params.values())))
+    clean = harmonic_batch(params.get('amplitude', 1.0), params.get('frequency', 1.0),
+                           params.get('phase', 0.0), t, rows)
+    noise = NoiseBank(seed).noise(noise_mean, noise_covariance, samples)
+    noisy = clean + noise[None, :]
+    filtered = filter_batch(filter_type, noisy, params, fs)
+    return error_metrics(clean, noisy, filtered)
+
+
+def _sweep_chunk(args):
+    params, kwargs = args
+    return sweep(params, **kwargs)
+
+
+def run_sweep(params, filter_type='Moving Average', chunk_rows=256, workers=None, **kwargs):
+    """
+    Великий перебір: params ділиться на порції по chunk_rows рядків, які рахуються
+    в пулі процесів; результати склеюються в початковому порядку рядків.
+    """
+    rows = len(next(iter(params.values())))
+    kwargs['filter_type'] = filter_type
+    chunks = [({name: np.broadcast_to(values, (rows,))[start:start + chunk_rows] for name, values in params.items()}, kwargs)
+              for start in range(0, rows, chunk_rows)]
+    if workers == 1 or len(chunks) == 1:
+        results = [_sweep_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_sweep_chunk, chunks))
+    return {name: np.concatenate([r[name] for r in results]) for name in results[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Перебір параметрів гармоніки та фільтрів")
+    parser.add_argument('--filter', default='Moving Average', choices=FILTER_TYPES)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-rows', type=int, default=128)
+    args = parser.parse_args()
+
+    if args.filter == 'Butterworth':
+        tuning = {'cutoff': np.linspace(0.5, 10.0, 20)}
+    else:
+        tuning = {'window_size': np.arange(5, 505, 25)}
+    params = param_grid(amplitude=np.linspace(0.5, 5.0, 10), frequency=np.linspace(0.5, 5.0, 10), **tuning)
+
+    started = time.perf_counter()
+    metrics = run_sweep(params, args.filter, chunk_rows=args.chunk_rows, workers=args.workers)
+    elapsed = time.perf_counter() - started
+    rows = len(metrics['mse_filtered'])
+    best = np.nanargmax(metrics['snr_improvement_db'])
+    print(f"{rows} комбінацій за {elapsed:.2f} с ({rows / elapsed:.0f} комбінацій/с)")
+    print("Найкраща комбінація:", {name: params[name][best].item() for name in params},
+          f"покращення SNR {metrics['snr_improvement_db'][best]:.2f} дБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# Лабораторна 6: лінійна регресія методом найменших квадратів та градієнтним спуском
+from .linreg import generate_data, least_squares_fit, polyfit_line, gradient_descent
+from .fitting import (LinearFitAccumulator, least_squares_fit_chunks, least_squares_fit_parallel,
+                      least_squares_fit_batch)
+from .gradient import minibatch_gradient_descent, array_batches
+from .regression import LinearRegression, RegressionAccumulator, polynomial_features, fit_frames
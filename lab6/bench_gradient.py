@@ -0,0 +1,67 @@
+# Бенчмарк градієнтного спуску проти np.polyfit та замкненої формули МНК
+# Запуск з кореня репозиторію: python -m lab6.bench_gradient
+import timeit
+
+import numpy as np
+
+from .fitting import least_squares_fit_batch
+from .gradient import gradient_descent, minibatch_gradient_descent, array_batches
+
+k_true = 2
+b_true = 11
+sizes = [10 ** 2, 10 ** 4, 10 ** 6]
+
+
+# градієнтний спуск у вигляді з лабораторної 6 (для порівняння)
+def gradient_descent_loop(x, y, learning_rate=0.01, n_iter=1000):
+    k = 0.0
+    b = 0.0
+    n = len(x)
+    errors = []
+    for i in range(n_iter):
+        y_pred = k * x + b
+        error = np.mean((y - y_pred)**2)
+        errors.append(error)
+        dk = -2 * np.sum((y - y_pred) * x) / n
+        db = -2 * np.sum(y - y_pred) / n
+        k -= learning_rate * dk
+        b -= learning_rate * db
+    return k, b, errors
+
+
+def timed(func, repeats=3):
+    result = func()
+    return timeit.timeit(func, number=repeats) / repeats * 1000, result
+
+
+def main():
+    rng = np.random.default_rng(0)
+    methods = {
+        'цикл (лаб. 6)': lambda x, y: gradient_descent_loop(x, y)[:2],
+        'спуск, 1000 ітерацій': lambda x, y: gradient_descent(x, y)[:2],
+        'спуск, tol=1e-12': lambda x, y: gradient_descent(x, y, n_iter=100000, tol=1e-12)[:2],
+        'adam, пакети 4096': lambda x, y: minibatch_gradient_descent(
+            array_batches(x, y, 4096, seed=0), 'adam', 0.5, epochs=max(5, 2000 * 4096 // len(x)), tol=1e-7)[:2],
+        'np.polyfit': lambda x, y: tuple(np.polyfit(x, y, 1)),
+        'замкнена формула': lambda x, y: least_squares_fit_batch(x, y),
+    }
+
+    for n in sizes:
+        x = np.linspace(0, 10, n)
+        y = k_true * x + b_true + rng.normal(0, 3, n)
+        print(f"\nn = {n}")
+        for name, method in methods.items():
+            ms, (k, b) = timed(lambda: method(x, y))
+            print(f"  {name:<22} {ms:>10.2f} мс   k={float(k):.4f} b={float(b):.4f}")
+
+    # багато незалежних регресій одразу
+    series, n = 1000, 1000
+    x = np.linspace(0, 10, n)
+    y = k_true * x + b_true + rng.normal(0, 3, (series, n))
+    loop_ms, _ = timed(lambda: [gradient_descent(x, row) for row in y], repeats=1)
+    batch_ms, _ = timed(lambda: gradient_descent(x, y), repeats=1)
+    print(f"\n{series} рядів по {n} точок: по черзі {loop_ms:.1f} мс, пакетом {batch_ms:.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# Набір бенчмарків лабораторної 6: МНК у замкненій формі, потоковий МНК,
+# np.polyfit та градієнтний спуск для n = 10^2 ... 10^8 точок.
+# Для кожного методу записується час, пікова пам'ять (tracemalloc) та похибка
+# оцінок відносно справжніх k, b; результати дописуються у файл JSON lines.
+#
+# Запуск з кореня репозиторію: python -m lab6.benchmark --max-power 7
+# (n = 10^8 потребує кількох ГБ пам'яті: x, y та матриця np.polyfit)
+import argparse
+import datetime
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from .fitting import least_squares_fit_chunks
+from .linreg import k_true, b_true, noise_std, generate_data, least_squares_fit, polyfit_line, gradient_descent
+
+stream_chunk = 10 ** 6
+
+
+def _streaming_fit(x, y):
+    return least_squares_fit_chunks((x[i:i + stream_chunk], y[i:i + stream_chunk])
+                                    for i in range(0, len(x), stream_chunk))
+
+
+def _gradient_fit(x, y):
+    k, b, errors = gradient_descent(x, y, n_iter=100000, tol=1e-14)
+    return k, b
+
+
+METHODS = {
+    'closed_form': least_squares_fit,
+    'streaming': _streaming_fit,
+    'polyfit': polyfit_line,
+    'gradient_descent': _gradient_fit,
+}
+
+
+def tolerances(x, n):
+    """Допустима похибка оцінок: 6 стандартних похибок МНК для шуму noise_std."""
+    se_k = noise_std / (np.std(x) * np.sqrt(n))
+    se_b = noise_std * np.sqrt(1 / n + np.mean(x) ** 2 / (n * np.var(x)))
+    return 6 * se_k, 6 * se_b
+
+
+def run_method(method, x, y, repeats):
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        k, b = method(x, y)
+        times.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    method(x, y)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(k), float(b), min(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк методів лінійної регресії лабораторної 6")
+    parser.add_argument('--min-power', type=int, default=2)
+    parser.add_argument('--max-power', type=int, default=8)
+    parser.add_argument('--methods', nargs='+', default=list(METHODS), choices=list(METHODS))
+    parser.add_argument('--output', default='lab6_benchmark.jsonl', help="файл результатів (JSON lines)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    run_at = datetime.datetime.now().isoformat(timespec='seconds')
+    failures = 0
+    with open(args.output, 'a', encoding='utf-8') as out:
+        for power in range(args.min_power, args.max_power + 1):
+            n = 10 ** power
+            x, _, y_s = generate_data(n=n, seed=args.seed)
+            tol_k, tol_b = tolerances(x, n)
+            repeats = 5 if n <= 10 ** 6 else 1
+            for name in args.methods:
+                k, b, seconds, peak = run_method(METHODS[name], x, y_s, repeats)
+                ok = abs(k - k_true) <= tol_k and abs(b - b_true) <= tol_b
+                failures += not ok
+                record = {
+                    'run_at': run_at, 'method': name, 'n': n, 'seconds': seconds, 'peak_bytes': peak,
+                    'k': k, 'b': b, 'error_k': k - k_true, 'error_b': b - b_true, 'ok': bool(ok),
+                    'numpy': np.__version__, 'python': platform.python_version(),
+                }
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+                print(f"n=10^{power:<2} {name:<17} {seconds * 1000:>12.2f} мс {peak / 2 ** 20:>10.1f} МБ "
+                      f"k={k:.5f} b={b:.5f} {'OK' if ok else 'ПОХИБКА'}")
+            del x, y_s
+
+    print(f"\nРезультати дописано у {args.output}")
+    if failures:
+        raise SystemExit(f"{failures} оцінок поза допустимою похибкою")
+
+
+if __name__ == "__main__":
+    main()
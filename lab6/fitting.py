@@ -0,0 +1,106 @@
+# Метод найменших квадратів для y = kx + b по порціях даних
+# Замість кількох проходів (два середні, потім дві суми добутків) накопичуються
+# середні та центровані суми (алгоритм Велфорда/Чана) - один прохід, стабільно
+# чисельно, часткові результати можна об'єднувати між процесами.
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+class LinearFitAccumulator:
+    """
+    Накопичувач статистик для лінійної регресії y = kx + b.
+    Для пакету з S незалежних рядів x, y мають форму (S, n), а всі
+    статистики - форму (S,); для одного ряду - скаляри.
+    """
+
+    def __init__(self, shape=()):
+        self.n = np.zeros(shape)
+        self.mean_x = np.zeros(shape)
+        self.mean_y = np.zeros(shape)
+        self.m2_x = np.zeros(shape)   # сума (x - mean_x)^2
+        self.m2_y = np.zeros(shape)   # сума (y - mean_y)^2
+        self.c_xy = np.zeros(shape)   # сума (x - mean_x)(y - mean_y)
+
+    @classmethod
+    def from_chunk(cls, x, y):
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        acc = cls(x.shape[:-1])
+        acc.n = np.full(x.shape[:-1], x.shape[-1], dtype=float)
+        acc.mean_x = x.mean(axis=-1)
+        acc.mean_y = y.mean(axis=-1)
+        dx = x - acc.mean_x[..., None]
+        dy = y - acc.mean_y[..., None]
+        acc.m2_x = np.einsum('...i,...i->...', dx, dx)
+        acc.m2_y = np.einsum('...i,...i->...', dy, dy)
+        acc.c_xy = np.einsum('...i,...i->...', dx, dy)
+        return acc
+
+    def update(self, x, y):
+        """Додає порцію спостережень (останній вимір - номер спостереження)."""
+        if np.shape(x)[-1] == 0:
+            return self
+        return self.merge(LinearFitAccumulator.from_chunk(x, y))
+
+    def merge(self, other):
+        """Об'єднує статистики іншого накопичувача (наприклад, з паралельного обробника)."""
+        n = self.n + other.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(n > 0, other.n / n, 0.0)
+            cross = np.where(n > 0, self.n * other.n / n, 0.0)
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        self.mean_x = self.mean_x + dx * weight
+        self.mean_y = self.mean_y + dy * weight
+        self.m2_x = self.m2_x + other.m2_x + dx * dx * cross
+        self.m2_y = self.m2_y + other.m2_y + dy * dy * cross
+        self.c_xy = self.c_xy + other.c_xy + dx * dy * cross
+        self.n = n
+        return self
+
+    def result(self):
+        """Повертає оцінки (k, b)."""
+        k = self.c_xy / self.m2_x
+        b = self.mean_y - k * self.mean_x
+        return k, b
+
+    def r_squared(self):
+        return self.c_xy ** 2 / (self.m2_x * self.m2_y)
+
+
+def least_squares_fit_chunks(chunks):
+    """МНК по ітератору порцій (x, y) без зберігання всіх даних у пам'яті."""
+    acc = None
+    for x, y in chunks:
+        if acc is None:
+            acc = LinearFitAccumulator(np.broadcast_shapes(np.shape(x), np.shape(y))[:-1])
+        acc.update(x, y)
+    if acc is None:
+        raise ValueError("Немає даних для апроксимації")
+    return acc.result()
+
+
+def _chunk_statistics(chunk):
+    # порція може бути функцією-завантажувачем, щоб дані не передавались між процесами
+    x, y = chunk() if callable(chunk) else chunk
+    return LinearFitAccumulator.from_chunk(x, y)
+
+
+def least_squares_fit_parallel(chunks, workers=None):
+    """
+    МНК з обчисленням статистик порцій у пулі процесів. Порція - пара (x, y) або
+    функція без аргументів, що її повертає (наприклад, читає частину файлу).
+    Часткові результати об'єднуються в порядку порцій, тому відповідь детермінована.
+    """
+    acc = None
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for part in executor.map(_chunk_statistics, chunks):
+            acc = part if acc is None else acc.merge(part)
+    if acc is None:
+        raise ValueError("Немає даних для апроксимації")
+    return acc.result()
+
+
+def least_squares_fit_batch(x, y):
+    """МНК для багатьох незалежних рядів одразу: x, y форми (S, n) -> масиви k, b форми (S,)."""
+    return LinearFitAccumulator.from_chunk(x, y).result()
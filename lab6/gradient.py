@@ -0,0 +1,133 @@
+# Градієнтний спуск для y = kx + b
+# Для повного набору даних градієнти і MSE виражаються через центровані
+# статистики (середні, дисперсію x, коваріацію x та y), які рахуються один раз -
+# кожна ітерація коштує O(1) замість кількох проходів по масивах.
+# Для даних, що не вміщуються в пам'ять, - міні-пакетний спуск (SGD, momentum, Adam).
+import numpy as np
+
+from .fitting import LinearFitAccumulator
+
+
+def gradient_descent(x, y, learning_rate=0.01, n_iter=1000, tol=None):
+    """
+    Градієнтний спуск з тими самими ітераціями, що й у лабораторній 6.
+    x, y - ряди форми (n,) або пакет незалежних рядів форми (S, n).
+    tol - зупинка, коли зміна MSE за ітерацію не перевищує tol * MSE.
+    Повертає k, b та історію MSE (масив довжини кількості виконаних ітерацій;
+    для пакету - форми (ітерації, S)).
+    """
+    stats = LinearFitAccumulator.from_chunk(x, y)
+    n = stats.n
+    mean_x, mean_y = stats.mean_x, stats.mean_y
+    var_x, var_y, cov_xy = stats.m2_x / n, stats.m2_y / n, stats.c_xy / n
+
+    k = np.zeros(np.shape(n))
+    b = np.zeros(np.shape(n))
+    errors = np.empty((n_iter,) + np.shape(n))
+    active = np.ones(np.shape(n), dtype=bool)
+    done = n_iter
+
+    for i in range(n_iter):
+        # d - середній залишок y - (kx + b)
+        d = mean_y - k * mean_x - b
+        errors[i] = var_y - 2 * k * cov_xy + k * k * var_x + d * d
+
+        dk = -2 * (cov_xy - k * var_x + mean_x * d)
+        db = -2 * d
+        k = np.where(active, k - learning_rate * dk, k)
+        b = np.where(active, b - learning_rate * db, b)
+
+        if tol is not None and i > 0:
+            active &= np.abs(errors[i - 1] - errors[i]) > tol * np.abs(errors[i])
+            if not active.any():
+                done = i + 1
+                break
+
+    return k[()], b[()], errors[:done]
+
+
+class _Optimizer:
+    """Правило оновлення параметрів theta = (k, b) для міні-пакетного спуску."""
+
+    def __init__(self, method, learning_rate, beta1=0.9, beta2=0.999, eps=1e-8):
+        if method not in ('sgd', 'momentum', 'adam'):
+            raise ValueError(f"Невідомий метод: {method}. Доступні: sgd, momentum, adam")
+        self.method = method
+        self.learning_rate = learning_rate
+        self.beta1, self.beta2, self.eps = beta1, beta2, eps
+        self.velocity = 0.0
+        self.second = 0.0
+        self.steps = 0
+
+    def step(self, theta, grad):
+        self.steps += 1
+        if self.method == 'sgd':
+            return theta - self.learning_rate * grad
+        if self.method == 'momentum':
+            self.velocity = self.beta1 * self.velocity + grad
+            return theta - self.learning_rate * self.velocity
+        self.velocity = self.beta1 * self.velocity + (1 - self.beta1) * grad
+        self.second = self.beta2 * self.second + (1 - self.beta2) * grad * grad
+        m_hat = self.velocity / (1 - self.beta1 ** self.steps)
+        v_hat = self.second / (1 - self.beta2 ** self.steps)
+        return theta - self.learning_rate * m_hat / (np.sqrt(v_hat) + self.eps)
+
+
+def minibatch_gradient_descent(batches, method='adam', learning_rate=0.01, epochs=100, tol=None,
+                               max_steps=100000):
+    """
+    Міні-пакетний градієнтний спуск. batches - функція без аргументів, що повертає
+    ітератор порцій (x, y) для однієї епохи (наприклад, читає файл частинами);
+    порції можуть бути пакетами незалежних рядів форми (S, m).
+    tol - зупинка, коли відносна зміна середньої MSE за епоху не перевищує tol.
+    Повертає k, b та історію MSE по кроках (попередньо виділений масив, обрізаний).
+    """
+    optimizer = _Optimizer(method, learning_rate)
+    theta = None
+    history = None
+    step = 0
+    previous = None
+
+    for epoch in range(epochs):
+        epoch_loss = 0.0
+        epoch_batches = 0
+        for x, y in batches():
+            x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+            if theta is None:
+                theta = np.zeros((2,) + x.shape[:-1])
+                history = np.empty((max_steps,) + x.shape[:-1])
+            if step == max_steps:
+                return theta[0], theta[1], history[:step]
+
+            # один залишок на пакет - з нього MSE і обидва градієнти
+            residual = y - (theta[0][..., None] * x + theta[1][..., None])
+            loss = np.mean(residual * residual, axis=-1)
+            grad = np.stack((-2 * np.mean(residual * x, axis=-1), -2 * np.mean(residual, axis=-1)))
+            theta = optimizer.step(theta, grad)
+
+            history[step] = loss
+            step += 1
+            epoch_loss = epoch_loss + loss
+            epoch_batches += 1
+
+        epoch_loss = epoch_loss / max(epoch_batches, 1)
+        if tol is not None and previous is not None and \
+                np.all(np.abs(previous - epoch_loss) <= tol * np.abs(epoch_loss)):
+            break
+        previous = epoch_loss
+
+    return theta[0], theta[1], history[:step]
+
+
+def array_batches(x, y, batch_size=1024, shuffle=True, seed=None):
+    """Джерело міні-пакетів для масивів у пам'яті (для minibatch_gradient_descent)."""
+    rng = np.random.default_rng(seed)
+    n = np.shape(x)[-1]
+
+    def epoch():
+        order = rng.permutation(n) if shuffle else np.arange(n)
+        for start in range(0, n, batch_size):
+            idx = order[start:start + batch_size]
+            yield x[..., idx], y[..., idx]
+
+    return epoch
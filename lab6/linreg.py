@@ -0,0 +1,46 @@
+# Алгоритми лабораторної 6 (з lab6.ipynb) у вигляді модуля:
+# генерація точок навколо прямої y = kx + b, метод найменших квадратів
+# та градієнтний спуск
+import numpy as np
+
+from .gradient import gradient_descent as _gradient_descent
+
+# параметри прямої та кількість точок з лабораторної
+k_true = 2
+b_true = 11
+n_points = 100
+noise_std = 3
+
+
+def generate_data(k=k_true, b=b_true, n=n_points, noise_std=noise_std, seed=None, chunk_size=10 ** 7):
+    """
+    Точки навколо прямої y = kx + b на відрізку [0, 10] з нормальним шумом.
+    Повертає x, y (пряма без шуму) та y_s (зашумлені точки).
+    Шум додається порціями, щоб для великих n не виділяти ще один масив розміру n.
+    """
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 10, n)
+    y = k * x + b
+    y_s = y.copy()
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        y_s[start:stop] += rng.normal(0, noise_std, stop - start)
+    return x, y, y_s
+
+
+def least_squares_fit(x, y):
+    x_mean = np.mean(x)
+    y_mean = np.mean(y)
+    k = np.sum((x - x_mean) * (y - y_mean)) / np.sum((x - x_mean)**2)
+    b = y_mean - (k * x_mean)
+    return k, b
+
+
+def polyfit_line(x, y):
+    k, b = np.polyfit(x, y, 1)
+    return k, b
+
+
+def gradient_descent(x, y, learning_rate=0.01, n_iter=1000, tol=None):
+    """Градієнтний спуск лабораторної; повертає k, b та масив похибок (MSE) по ітераціях."""
+    return _gradient_descent(x, y, learning_rate, n_iter, tol)
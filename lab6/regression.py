@@ -0,0 +1,202 @@
+# Множинна та поліноміальна регресія для n ознак
+# Нормальні рівняння XᵀX b = Xᵀy накопичуються по порціях у центрованому вигляді
+# (середні та суми центрованих добутків, об'єднання за формулами Чана), тому модель
+# можна будувати з потоку або паралельних частин даних. Розв'язок - Холецький або QR
+# уже сформованої XᵀX (обумовленість QR тут не покращує, лише не вимагає додатної
+# визначеності); для погано обумовлених ознак - ridge-регуляризація.
+#
+# Приклади ознак:
+#   VHI ~ SMN, SMT, VCI, TCI                        (дані лабораторних 2-3)
+#   Global_active_power ~ Sub_metering_1, _2, _3    (дані лабораторної 4)
+from itertools import combinations_with_replacement
+
+import numpy as np
+from scipy.linalg import LinAlgError, cho_factor, cho_solve, solve_triangular
+
+VHI_FEATURES = ['SMN', 'SMT', 'VCI', 'TCI']
+VHI_TARGET = 'VHI'
+POWER_FEATURES = ['Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+POWER_TARGET = 'Global_active_power'
+
+
+def polynomial_features(X, degree=2):
+    """
+    Усі одночлени ознак X (n, p) степеня від 1 до degree, включно з добутками ознак.
+    Повертає матрицю (n, m) і список кортежів індексів ознак для кожного стовпця.
+    """
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X[:, None]
+    terms = [combo for d in range(1, degree + 1)
+             for combo in combinations_with_replacement(range(X.shape[1]), d)]
+    out = np.empty((X.shape[0], len(terms)))
+    for j, combo in enumerate(terms):
+        column = out[:, j]
+        column[:] = X[:, combo[0]]
+        for i in combo[1:]:
+            column *= X[:, i]
+    return out, terms
+
+
+def _check_rank(diag, rcond=1e-10):
+    diag = np.abs(diag)
+    if diag.min() <= rcond * diag.max():
+        raise LinAlgError("Система нормальних рівнянь вироджена")
+
+
+class RegressionAccumulator:
+    """
+    Накопичувач нормальних рівнянь для y = Xβ + β0.
+    X - матриця (n, p), y - вектор (n,) або матриця (n, t) для кількох цільових змінних.
+    """
+
+    def __init__(self, n_features, n_targets=None):
+        shape_y = () if n_targets is None else (n_targets,)
+        self.n = 0
+        self.mean_x = np.zeros(n_features)
+        self.mean_y = np.zeros(shape_y)
+        self.c_xx = np.zeros((n_features, n_features))
+        self.c_xy = np.zeros((n_features,) + shape_y)
+        self.c_yy = np.zeros(shape_y + shape_y)
+
+    @classmethod
+    def from_chunk(cls, X, y):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if X.ndim == 1:
+            X = X[:, None]
+        acc = cls(X.shape[1], None if y.ndim == 1 else y.shape[1])
+        acc.n = len(X)
+        acc.mean_x = X.mean(axis=0)
+        acc.mean_y = y.mean(axis=0)
+        dx = X - acc.mean_x
+        dy = y - acc.mean_y
+        acc.c_xx = dx.T @ dx
+        acc.c_xy = dx.T @ dy
+        acc.c_yy = dy.T @ dy
+        return acc
+
+    def update(self, X, y):
+        """Додає порцію рядків (X, y)."""
+        if len(X) == 0:
+            return self
+        return self.merge(RegressionAccumulator.from_chunk(X, y))
+
+    def merge(self, other):
+        """Об'єднує статистики іншого накопичувача (порядок об'єднання не впливає на результат)."""
+        n = self.n + other.n
+        if n == 0:
+            return self
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        cross = self.n * other.n / n
+        self.mean_x = self.mean_x + dx * (other.n / n)
+        self.mean_y = self.mean_y + dy * (other.n / n)
+        self.c_xx = self.c_xx + other.c_xx + np.multiply.outer(dx, dx) * cross
+        self.c_xy = self.c_xy + other.c_xy + np.multiply.outer(dx, dy) * cross
+        self.c_yy = self.c_yy + other.c_yy + np.multiply.outer(dy, dy) * cross
+        self.n = n
+        return self
+
+    def solve(self, ridge=0.0, method='cholesky'):
+        """
+        Розв'язує нормальні рівняння; ridge - коефіцієнт L2-регуляризації
+        (вільний член не штрафується). method: 'cholesky' або 'qr'.
+        Повертає (coef, intercept).
+        """
+        A = self.c_xx + ridge * np.eye(len(self.c_xx))
+        if method not in ('cholesky', 'qr'):
+            raise ValueError(f"Невідомий метод: {method}. Доступні: cholesky, qr")
+        try:
+            if method == 'cholesky':
+                factor = cho_factor(A)
+                _check_rank(np.diag(factor[0]))
+                coef = cho_solve(factor, self.c_xy)
+            else:
+                q, r = np.linalg.qr(A)
+                _check_rank(np.diag(r))
+                coef = solve_triangular(r, q.T @ self.c_xy)
+        except LinAlgError:
+            # вироджена система (наприклад, лінійно залежні ознаки) - розв'язок мінімальної норми
+            coef = np.linalg.lstsq(A, self.c_xy, rcond=None)[0]
+        intercept = self.mean_y - self.mean_x @ coef
+        return coef, intercept
+
+    def r_squared(self, coef):
+        """Коефіцієнт детермінації на накопичених даних, без повторного проходу."""
+        sse = self.c_yy - 2 * coef.T @ self.c_xy + coef.T @ self.c_xx @ coef
+        if np.ndim(sse) == 2:
+            return 1 - np.diag(sse) / np.diag(self.c_yy)
+        return 1 - sse / self.c_yy
+
+
+class LinearRegression:
+    """
+    Регресія за кількома ознаками з необов'язковим поліноміальним розширенням.
+    fit() приймає весь набір даних, partial_fit() - чергову порцію.
+    """
+
+    def __init__(self, degree=1, ridge=0.0, method='cholesky'):
+        self.degree = degree
+        self.ridge = ridge
+        self.method = method
+        self.accumulator = None
+        self.coef_ = None
+        self.intercept_ = None
+        self.terms_ = None
+
+    def _features(self, X):
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X[:, None]
+        if self.degree == 1:
+            self.terms_ = [(j,) for j in range(X.shape[1])]
+            return X
+        X, self.terms_ = polynomial_features(X, self.degree)
+        return X
+
+    def partial_fit(self, X, y):
+        chunk = RegressionAccumulator.from_chunk(self._features(X), y)
+        self.accumulator = chunk if self.accumulator is None else self.accumulator.merge(chunk)
+        self.coef_, self.intercept_ = self.accumulator.solve(self.ridge, self.method)
+        return self
+
+    def fit(self, X, y):
+        self.accumulator = None
+        return self.partial_fit(X, y)
+
+    def fit_chunks(self, chunks):
+        """Навчання на ітераторі порцій (X, y); розв'язок обчислюється один раз наприкінці."""
+        self.accumulator = None
+        for X, y in chunks:
+            chunk = RegressionAccumulator.from_chunk(self._features(X), y)
+            self.accumulator = chunk if self.accumulator is None else self.accumulator.merge(chunk)
+        if self.accumulator is None:
+            raise ValueError("Немає даних для навчання (порожній потік або всі рядки з пропусками)")
+        self.coef_, self.intercept_ = self.accumulator.solve(self.ridge, self.method)
+        return self
+
+    def predict(self, X):
+        return self._features(X) @ self.coef_ + self.intercept_
+
+    def score(self):
+        """R² на всіх даних, використаних для навчання."""
+        return self.accumulator.r_squared(self.coef_)
+
+
+def fit_frames(frames, features, target, degree=1, ridge=0.0):
+    """
+    Навчає модель на таблиці або ітераторі таблиць (наприклад, pd.read_csv(..., chunksize=...)).
+    Рядки з пропусками у вибраних стовпцях пропускаються.
+    """
+    if hasattr(frames, 'columns'):
+        frames = [frames]
+
+    def chunks():
+        for frame in frames:
+            values = frame[list(features) + [target]].to_numpy(dtype=float)
+            values = values[~np.isnan(values).any(axis=1)]
+            if len(values):
+                yield values[:, :-1], values[:, -1]
+
+    return LinearRegression(degree, ridge).fit_chunks(chunks())